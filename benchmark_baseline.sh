@@ -16,16 +16,25 @@ declare -a EPISODES_BASELINE
 echo "Running benchmark for 20 different seeds..."
 echo "============================================"
 
+# Все 20 seed'ов каждой конфигурации обучаются в одном процессе (EnsembleTrainer).
+# Ансамбль статистически эквивалентен отдельным запускам run/train.py, но не
+# совпадает с ними по seed'ам: число эпизодов отдельного seed может отличаться
+# от прежних результатов (analysis/baseline_benchmark_results.txt), сравнивать
+# можно только средние по seed'ам.
+echo "Training 0_original (seeds 1-20)..."
+python -m src train-ensemble --name "benchmark_0_original" \
+    --state absolute --reward basic \
+    --episodes 10000 --seeds 1-20 > /dev/null 2>&1
+
+echo "Training 1_with_baseline (seeds 1-20)..."
+python -m src train-ensemble --name "benchmark_1_with_baseline" \
+    --state absolute --reward basic --baseline \
+    --episodes 10000 --seeds 1-20 > /dev/null 2>&1
+
 for seed in {1..20}; do
     echo ""
     echo "--- Seed $seed / 20 ---"
     
-    # Обучение без baseline
-    echo "Training 0_original (seed=$seed)..."
-    python run/train.py --name "benchmark_0_original_seed${seed}" \
-        --state absolute --reward basic \
-        --episodes 10000 --seed $seed > /dev/null 2>&1
-    
     #読み取り数のepisodesを取得
     csv_path_original="artifacts/ablation/benchmark_0_original_seed${seed}/stats.csv"
     if [ -f "$csv_path_original" ]; then
@@ -37,12 +46,6 @@ for seed in {1..20}; do
         EPISODES_ORIGINAL[$seed]="ERROR"
     fi
     
-    # Обучение с baseline
-    echo "Training 1_with_baseline (seed=$seed)..."
-    python run/train.py --name "benchmark_1_with_baseline_seed${seed}" \
-        --state absolute --reward basic --baseline \
-        --episodes 10000 --seed $seed > /dev/null 2>&1
-    
     #읽取最後的episodeを取得
     csv_path_baseline="artifacts/ablation/benchmark_1_with_baseline_seed${seed}/stats.csv"
     if [ -f "$csv_path_baseline" ]; then
@@ -0,0 +1,196 @@
+import argparse
+import json
+import math
+import os
+
+# Эталонные конфигурации (как в run_ablation.sh)
+REFERENCE_CONFIGS = {
+    "0_original": {"state": "absolute", "reward": "basic"},
+    "1_with_baseline": {"state": "absolute", "reward": "basic", "baseline": True},
+    "2_only_entropy": {"state": "absolute", "reward": "basic", "entropy": 0.01},
+    "3_only_relative_state": {"state": "relative", "reward": "basic"},
+    "4_only_enhanced_reward": {"state": "absolute", "reward": "enhanced"},
+    "5_sample_reuse": {"state": "absolute", "reward": "basic", "reuse_epochs": 4},
+}
+
+METRICS = ("episodes", "env_steps", "wall_time", "steps_per_sec")
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--configs", nargs="+", default=list(REFERENCE_CONFIGS), choices=list(REFERENCE_CONFIGS))
+    parser.add_argument("--seeds", nargs="+", default=["1-5"], help="Seeds, e.g. '1-20' or '1 5 7'")
+    parser.add_argument("--episodes", type=int, default=10000, help="Episode cap per run")
+    parser.add_argument("--confidence", type=float, default=0.95, help="Confidence level of bootstrap intervals")
+    parser.add_argument("--bootstrap", type=int, default=2000, help="Bootstrap resamples")
+    parser.add_argument("--reference", type=str, default=None, help="Stored reference run (JSON written by --json)")
+    parser.add_argument("--json", type=str, default="artifacts/stats/convergence.json", help="Write results to this path")
+    parser.add_argument("--out_dir", type=str, default="artifacts/bench", help="Where per-run stats/checkpoints go")
+    return parser.parse_args(argv)
+
+def _finite(x):
+    return x if x is not None and math.isfinite(x) else None
+
+def run_config(name, options, seeds, args):
+    """Обучает конфигурацию на всех seed'ах последовательно, возвращает список сводок Trainer."""
+    from src.environment.game_env import GameEnv
+    from src.agent.reinforce_agent import ReinforceAgent
+    from src.training.trainer import Trainer
+    from src.training.logger import Logger
+    from src.utils.config import EnvConfig, AgentConfig, TrainConfig
+    from src.utils.seed import set_global_seed, training_seeds
+    import torch
+
+    runs = []
+    for seed in seeds:
+        run_name = f"{name}_seed{seed}"
+        env_cfg = EnvConfig(state_mode=options["state"], reward_mode=options["reward"])
+        agent_cfg = AgentConfig(
+            use_normalization=options.get("norm", False),
+            entropy_coef=options.get("entropy", 0.0),
+            use_height_baseline=options.get("baseline", False),
+            reuse_epochs=options.get("reuse_epochs", 0),
+        )
+        train_cfg = TrainConfig(
+            num_episodes=args.episodes,
+            exp_name=run_name,
+            stats_path=os.path.join(args.out_dir, run_name, "stats.csv"),
+            checkpoint_dir=os.path.join(args.out_dir, run_name, "checkpoints"),
+        )
+
+        # Та же схема seed'ов, что в run/train.py
+        set_global_seed(seed)
+        agent = ReinforceAgent(agent_cfg)
+        env_seed, sampler_seed = training_seeds(seed)
+        torch.manual_seed(sampler_seed)
+        env = GameEnv(env_cfg, env_seed)
+        logger = Logger(train_cfg.stats_path, verbose=False)
+        try:
+            result = Trainer(env, agent, train_cfg, logger).train()
+        finally:
+            logger.close()
+
+        result["seed"] = seed
+        runs.append(result)
+        print(f"{run_name}: {result['episodes']} episodes, {result['env_steps']} steps, "
+              f"{result['wall_time']:.1f}s ({'converged' if result['converged'] else 'not converged'})")
+    return runs
+
+def summarize(runs, args):
+    """
+    Episodes / env_steps / wall_time до сходимости считаются только по сошедшимся
+    запускам: запуск, упёршийся в --episodes, цензурирован (его значение — лишь
+    нижняя граница) и учитывается в поле censored. steps_per_sec — по всем запускам.
+    """
+    from src.utils.stats import bootstrap_ci
+
+    converged = [r for r in runs if r["converged"]]
+    summary = {"converged": len(converged), "censored": len(runs) - len(converged), "runs": len(runs)}
+    for metric in METRICS:
+        sample = runs if metric == "steps_per_sec" else converged
+        if not sample:
+            summary[metric] = {"mean": None, "ci_low": None, "ci_high": None}
+            continue
+        values = [r[metric] for r in sample]
+        low, high = bootstrap_ci(values, args.confidence, args.bootstrap)
+        summary[metric] = {"mean": sum(values) / len(values), "ci_low": _finite(low), "ci_high": _finite(high)}
+    return summary
+
+def compare(current, reference, args):
+    """
+    Сравнивает с reference парно по seed'ам: bootstrap-интервал средней разности
+    (current - reference) на seed'ах, где сошлись оба запуска. Быстрее = интервал
+    целиком ниже нуля и у current не больше цензурированных запусков, чем у reference.
+    """
+    from src.utils.stats import bootstrap_paired_diff_ci
+
+    ref_by_seed = {r["seed"]: r for r in reference}
+    pairs = [(r, ref_by_seed[r["seed"]]) for r in current if r["seed"] in ref_by_seed]
+    both = [(c, r) for c, r in pairs if c["converged"] and r["converged"]]
+    censored_cur = sum(1 for c, _ in pairs if not c["converged"])
+    censored_ref = sum(1 for _, r in pairs if not r["converged"])
+
+    out = {"pairs": len(pairs), "paired_converged": len(both),
+           "censored_current": censored_cur, "censored_reference": censored_ref}
+    for metric in ("env_steps", "wall_time"):
+        cur = [c[metric] for c, _ in both]
+        ref = [r[metric] for _, r in both]
+        if not both:
+            out[metric] = {"change": None, "diff_ci_low": None, "diff_ci_high": None, "faster": False, "slower": False}
+            continue
+        low, high = bootstrap_paired_diff_ci(cur, ref, args.confidence, args.bootstrap)
+        ref_mean = sum(ref) / len(ref)
+        out[metric] = {
+            "change": (sum(cur) / len(cur) - ref_mean) / ref_mean if ref_mean else None,
+            "diff_ci_low": _finite(low),
+            "diff_ci_high": _finite(high),
+            "faster": _finite(high) is not None and high < 0 and censored_cur <= censored_ref,
+            "slower": (_finite(low) is not None and low > 0) or censored_cur > censored_ref,
+        }
+
+    samples, seconds = out["env_steps"]["faster"], out["wall_time"]["faster"]
+    if samples and seconds:
+        verdict = "faster in samples and seconds"
+    elif samples:
+        verdict = "faster in samples"
+    elif seconds:
+        verdict = "faster in seconds"
+    elif out["env_steps"]["slower"] or out["wall_time"]["slower"]:
+        verdict = "slower"
+    else:
+        verdict = "no significant change"
+    out["verdict"] = verdict
+    return out
+
+def main(argv=None):
+    args = parse_args(argv)
+    from run.train_ensemble import parse_seeds
+
+    seeds = parse_seeds(args.seeds)
+    reference = None
+    if args.reference:
+        with open(args.reference) as f:
+            reference = json.load(f)["configs"]
+
+    results = {"seeds": seeds, "episodes": args.episodes, "configs": {}}
+    for name in args.configs:
+        print(f"\n>>> Benchmark config: {name}")
+        runs = run_config(name, REFERENCE_CONFIGS[name], seeds, args)
+        entry = {"runs": runs, "summary": summarize(runs, args)}
+        if reference and name in reference:
+            entry["comparison"] = compare(runs, reference[name]["runs"], args)
+        results["configs"][name] = entry
+
+    print(f"\n{'='*100}")
+    print(f"{'Config':<24}{'Conv':>6}{'Episodes':>18}{'Env steps':>22}{'Wall (s)':>16}{'Steps/s':>10}")
+    for name, entry in results["configs"].items():
+        s = entry["summary"]
+        cells = []
+        for metric, fmt in (("episodes", ".0f"), ("env_steps", ".0f"), ("wall_time", ".1f")):
+            m = s[metric]
+            if m["mean"] is None:
+                cells.append("-")
+                continue
+            ci = f"[{m['ci_low']:{fmt}}-{m['ci_high']:{fmt}}]" if m["ci_low"] is not None else ""
+            cells.append(f"{m['mean']:{fmt}} {ci}")
+        print(f"{name:<24}{s['converged']:>3}/{s['runs']:<2}{cells[0]:>18}{cells[1]:>22}{cells[2]:>16}"
+              f"{s['steps_per_sec']['mean']:>10.0f}")
+        if "comparison" in entry:
+            c = entry["comparison"]
+            if c["paired_converged"]:
+                print(f"{'':<24}vs reference ({c['paired_converged']} paired seeds): "
+                      f"steps {c['env_steps']['change']:+.1%}, wall {c['wall_time']['change']:+.1%} -> {c['verdict']}")
+            else:
+                print(f"{'':<24}vs reference: no seed converged in both runs -> {c['verdict']}")
+            if c["censored_current"] or c["censored_reference"]:
+                print(f"{'':<24}capped at --episodes: current {c['censored_current']}, "
+                      f"reference {c['censored_reference']}")
+    print(f"{'='*100}")
+    print("Episodes / env steps / wall time are over converged runs only; runs capped at --episodes are censored.")
+
+    os.makedirs(os.path.dirname(args.json) or ".", exist_ok=True)
+    with open(args.json, "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"Results saved to {args.json}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,233 @@
+import argparse
+import itertools
+import json
+import os
+
+# Измерения sweep'а: поля EnvConfig / TrainConfig
+DIMENSIONS = ("grid_width", "grid_height", "block_max_width", "max_steps_per_episode")
+METRICS = (
+    ("env_steps_per_sec", "Env steps/sec"),
+    ("select_action_us", "select_action (us)"),
+    ("update_ms", "update_policy (ms)"),
+    ("peak_rss_mb", "Peak RSS (MB)"),
+)
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--grid_widths", type=int, nargs="+", default=[6, 12, 24, 48])
+    parser.add_argument("--grid_heights", type=int, nargs="+", default=[12, 24, 48, 96])
+    parser.add_argument("--block_max_widths", type=int, nargs="+", default=[2, 4, 8])
+    parser.add_argument("--max_steps", type=int, nargs="+", default=[2000, 5000, 10000, 20000],
+                        help="max_steps_per_episode values (update_policy runs on an episode of this length)")
+    parser.add_argument("--mode", choices=["axis", "grid"], default="axis",
+                        help="axis: vary one dimension at a time around the defaults; grid: full cartesian product")
+    parser.add_argument("--env_steps", type=int, default=20000, help="Timed env.step calls per point")
+    parser.add_argument("--actions", type=int, default=2000, help="Timed select_action calls per point")
+    parser.add_argument("--updates", type=int, default=3, help="Timed update_policy calls per point (median)")
+    parser.add_argument("--compile", action="store_true", help="Measure the compiled update_policy")
+    parser.add_argument("--threads", type=int, default=1, help="torch.set_num_threads in the measuring process")
+    parser.add_argument("--out_dir", type=str, default="artifacts/scaling", help="Report, JSON and plots go here")
+    return parser.parse_args(argv)
+
+def base_point() -> dict:
+    from src.utils.config import EnvConfig, TrainConfig
+    env_cfg, train_cfg = EnvConfig(), TrainConfig()
+    return {
+        "grid_width": env_cfg.grid_width,
+        "grid_height": env_cfg.grid_height,
+        "block_max_width": env_cfg.block_max_width,
+        "max_steps_per_episode": train_cfg.max_steps_per_episode,
+    }
+
+def sweep_points(args) -> list[dict]:
+    """Точки sweep'а; блок шире поля пропускается."""
+    values = dict(zip(DIMENSIONS, (args.grid_widths, args.grid_heights, args.block_max_widths, args.max_steps)))
+    base = base_point()
+    if args.mode == "grid":
+        points = [dict(zip(DIMENSIONS, combo)) for combo in itertools.product(*values.values())]
+    else:
+        points = [base]
+        for dim in DIMENSIONS:
+            points += [{**base, dim: v} for v in values[dim] if v != base[dim]]
+    return [p for p in points if p["block_max_width"] <= p["grid_width"]]
+
+def peak_rss_mb() -> float:
+    """Пиковый RSS процесса в MB: ru_maxrss — в KB на Linux и в байтах на macOS (Windows не поддерживается)."""
+    import resource
+    import sys
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss / (1024 * 1024) if sys.platform == "darwin" else rss / 1024
+
+def measure_point(point: dict, args) -> dict:
+    """
+    Выполняется в отдельном процессе (spawn), чтобы peak RSS относился только к этой точке.
+    select_action и update_policy меряются на состояниях из настоящей среды.
+    """
+    import statistics
+    import time
+    import numpy as np
+    import torch
+    from src.environment.game_env import GameEnv
+    from src.agent.reinforce_agent import ReinforceAgent
+    from src.utils.config import EnvConfig, AgentConfig
+
+    torch.set_num_threads(args.threads)
+    torch.manual_seed(0)
+    rng = np.random.default_rng(0)
+    env_cfg = EnvConfig(grid_width=point["grid_width"], grid_height=point["grid_height"],
+                        block_max_width=point["block_max_width"])
+    env = GameEnv(env_cfg, 0)
+    agent = ReinforceAgent(AgentConfig(compile_update=args.compile))
+    agent.grid_height = env_cfg.grid_height
+
+    # Пропускная способность среды (случайные действия, сброс по концу эпизода)
+    actions = rng.integers(0, 3, size=args.env_steps)
+    env.reset()
+    start = time.perf_counter()
+    for a in actions:
+        _, _, done, _ = env.step(int(a))
+        if done:
+            env.reset()
+    env_sps = args.env_steps / (time.perf_counter() - start)
+
+    def play(length):
+        """length шагов агента (через сбросы среды), награды копятся в буферах агента."""
+        state = env.reset()
+        for _ in range(length):
+            action = agent.select_action(state)
+            state, reward, done, _ = env.step(action)
+            agent.store_reward(reward)
+            if done:
+                state = env.reset()
+
+    # Задержка select_action (без update: буферы очищаются)
+    state = env.reset()
+    latencies = []
+    for _ in range(args.actions):
+        t0 = time.perf_counter()
+        action = agent.select_action(state)
+        latencies.append(time.perf_counter() - t0)
+        state, _, done, _ = env.step(action)
+        if done:
+            state = env.reset()
+    agent.clear_buffers()
+    base_rss = peak_rss_mb()
+
+    # update_policy на эпизоде длиной max_steps_per_episode (первый — прогрев/компиляция)
+    update_times = []
+    for i in range(args.updates + 1):
+        play(point["max_steps_per_episode"])
+        t0 = time.perf_counter()
+        agent.update_policy()
+        if i > 0:
+            update_times.append(time.perf_counter() - t0)
+
+    return {
+        **point,
+        "env_steps_per_sec": env_sps,
+        "select_action_us": statistics.median(latencies) * 1e6,
+        "update_ms": statistics.median(update_times) * 1000,
+        "base_rss_mb": base_rss,
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+def run_isolated(point: dict, args) -> dict:
+    import multiprocessing as mp
+    with mp.get_context("spawn").Pool(1) as pool:
+        return pool.apply(measure_point, (point, args))
+
+def axis_rows(results: list[dict], dim: str) -> list[dict]:
+    """Точки, где меняется только dim (остальные измерения — как в base_point)."""
+    base = base_point()
+    rows = [r for r in results if all(r[d] == base[d] for d in DIMENSIONS if d != dim)]
+    return sorted(rows, key=lambda r: r[dim])
+
+def scaling_exponent(rows: list[dict], dim: str, metric: str) -> float | None:
+    """Наклон в log-log координатах: metric ~ dim^k."""
+    import numpy as np
+    if len(rows) < 2:
+        return None
+    x = np.log([r[dim] for r in rows])
+    y = np.log([r[metric] for r in rows])
+    return float(np.polyfit(x, y, 1)[0])
+
+def plot(results: list[dict], out_dir: str) -> list[str]:
+    """Графики по измерениям; без matplotlib (extra `analysis`) — пустой список и предупреждение."""
+    try:
+        import matplotlib
+    except ImportError:
+        print("Warning: matplotlib is not installed (pip install -e '.[analysis]'); skipping plots.")
+        return []
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    paths = []
+    for dim in DIMENSIONS:
+        rows = axis_rows(results, dim)
+        if len(rows) < 2:
+            continue
+        fig, axes = plt.subplots(1, len(METRICS), figsize=(4 * len(METRICS), 3.5))
+        xs = [r[dim] for r in rows]
+        for ax, (metric, label) in zip(axes, METRICS):
+            ax.plot(xs, [r[metric] for r in rows], marker="o")
+            ax.set_xscale("log", base=2)
+            ax.set_xlabel(dim)
+            ax.set_title(label)
+            ax.grid(True, alpha=0.3)
+        fig.tight_layout()
+        path = os.path.join(out_dir, f"scaling_{dim}.png")
+        fig.savefig(path, dpi=100)
+        plt.close(fig)
+        paths.append(path)
+    return paths
+
+def write_report(results: list[dict], plots: list[str], args) -> str:
+    lines = ["# Scaling study", "",
+             f"Mode: {args.mode}, compiled update: {args.compile}, torch threads: {args.threads}", "",
+             "| grid_width | grid_height | block_max_width | max_steps | env steps/s | select_action (us) "
+             "| update_policy (ms) | base RSS (MB) | peak RSS (MB) |",
+             "|---|---|---|---|---|---|---|---|---|"]
+    for r in results:
+        lines.append(f"| {r['grid_width']} | {r['grid_height']} | {r['block_max_width']} | {r['max_steps_per_episode']} "
+                     f"| {r['env_steps_per_sec']:.0f} | {r['select_action_us']:.1f} | {r['update_ms']:.2f} "
+                     f"| {r['base_rss_mb']:.0f} | {r['peak_rss_mb']:.0f} |")
+
+    lines += ["", "## Scaling exponents (metric ~ dimension^k)", "",
+              "| dimension | " + " | ".join(label for _, label in METRICS) + " |",
+              "|---|" + "---|" * len(METRICS)]
+    for dim in DIMENSIONS:
+        rows = axis_rows(results, dim)
+        exps = [scaling_exponent(rows, dim, metric) for metric, _ in METRICS]
+        lines.append(f"| {dim} | " + " | ".join("-" if k is None else f"{k:+.2f}" for k in exps) + " |")
+
+    if plots:
+        lines += [""] + [f"![{os.path.basename(p)}]({os.path.basename(p)})" for p in plots]
+
+    path = os.path.join(args.out_dir, "report.md")
+    with open(path, "w") as f:
+        f.write("\n".join(lines) + "\n")
+    return path
+
+def main(argv=None):
+    args = parse_args(argv)
+    os.makedirs(args.out_dir, exist_ok=True)
+
+    points = sweep_points(args)
+    print(f"Measuring {len(points)} points ({args.mode} sweep)...")
+    print(f"{'W':>4}{'H':>5}{'BW':>4}{'Steps':>7}{'Env steps/s':>13}{'Act (us)':>10}{'Update (ms)':>13}{'Peak RSS':>10}")
+    results = []
+    for point in points:
+        r = run_isolated(point, args)
+        results.append(r)
+        print(f"{r['grid_width']:>4}{r['grid_height']:>5}{r['block_max_width']:>4}{r['max_steps_per_episode']:>7}"
+              f"{r['env_steps_per_sec']:>13.0f}{r['select_action_us']:>10.1f}{r['update_ms']:>13.2f}"
+              f"{r['peak_rss_mb']:>8.0f}MB")
+
+    with open(os.path.join(args.out_dir, "scaling.json"), "w") as f:
+        json.dump(results, f, indent=2)
+    plots = plot(results, args.out_dir)
+    report = write_report(results, plots, args)
+    print(f"Report saved to {report}")
+
+if __name__ == "__main__":
+    main()
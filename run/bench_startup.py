@@ -0,0 +1,86 @@
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+HEAVY_MODULES = ("torch", "pandas", "pygame", "matplotlib")
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Дочерний процесс: запускает CLI и при выходе печатает, какие тяжёлые модули загружены
+CHILD = (
+    "import sys, atexit\n"
+    "atexit.register(lambda: print('HEAVY:' + ','.join("
+    f"m for m in {HEAVY_MODULES!r} if m in sys.modules), file=sys.stderr))\n"
+    "from src.cli import main\n"
+    "sys.exit(main(sys.argv[1:]))\n"
+)
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeats", type=int, default=5, help="Runs per command (median is reported)")
+    parser.add_argument("--commands", nargs="+", default=None, help="Commands to measure (default: all)")
+    parser.add_argument("--max_ms", type=float, default=None,
+                        help="Fail (exit code 1) if any '<command> --help' median exceeds this budget")
+    parser.add_argument("--json", type=str, default=None, help="Write results as JSON to this path")
+    return parser.parse_args(argv)
+
+def measure(argv: list[str], repeats: int) -> tuple[float, list[str], int]:
+    """
+    Медиана wall-clock (мс) запуска интерпретатора + CLI, список тяжёлых модулей
+    и код возврата (ненулевой, если хотя бы один запуск упал — например, на импорте).
+    """
+    times, heavy, returncode = [], [], 0
+    for _ in range(repeats):
+        start = time.perf_counter()
+        proc = subprocess.run([sys.executable, "-c", CHILD] + argv, capture_output=True, text=True, cwd=REPO_ROOT)
+        times.append((time.perf_counter() - start) * 1000)
+        returncode = returncode or proc.returncode
+        for line in proc.stderr.splitlines():
+            if line.startswith("HEAVY:"):
+                heavy = [m for m in line[len("HEAVY:"):].split(",") if m]
+    return statistics.median(times), heavy, returncode
+
+def _time_python(code: str) -> float:
+    start = time.perf_counter()
+    subprocess.run([sys.executable, "-c", code], capture_output=True, cwd=REPO_ROOT)
+    return (time.perf_counter() - start) * 1000
+
+def main(argv=None):
+    args = parse_args(argv)
+    from src.cli import COMMANDS
+
+    commands = args.commands or list(COMMANDS)
+    baseline_ms, _, _ = measure(["--help"], args.repeats)
+    torch_ms = statistics.median(
+        _time_python("import torch") for _ in range(args.repeats)
+    )
+
+    results = {"interpreter_plus_cli_ms": baseline_ms, "import_torch_ms": torch_ms, "commands": {}}
+    print(f"{'Command':<18}{'--help (ms)':>12}  Heavy modules loaded")
+    print(f"{'(cli only)':<18}{baseline_ms:>12.1f}")
+    failed = False
+    for command in commands:
+        ms, heavy, returncode = measure([command, "--help"], args.repeats)
+        results["commands"][command] = {"help_ms": ms, "heavy_modules": heavy, "returncode": returncode}
+        status = f"  (exit code {returncode})" if returncode else ""
+        print(f"{command:<18}{ms:>12.1f}  {', '.join(heavy) or '-'}{status}")
+        if returncode or (args.max_ms is not None and ms > args.max_ms):
+            failed = True
+    print(f"\nFor reference, 'import torch' alone: {torch_ms:.1f} ms")
+
+    if args.json:
+        os.makedirs(os.path.dirname(args.json) or ".", exist_ok=True)
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"Results saved to {args.json}")
+
+    if failed:
+        print("Startup check failed: a command crashed or exceeded the budget"
+              + (f" ({args.max_ms:.0f} ms)" if args.max_ms is not None else ""))
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+import argparse
+import json
+import os
+import statistics
+import time
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--lengths", type=int, nargs="+", default=[50, 200, 1000, 2000], help="Episode lengths")
+    parser.add_argument("--repeats", type=int, default=20, help="Timed updates per length and mode")
+    parser.add_argument("--warmup", type=int, default=3, help="Untimed updates (compilation happens here)")
+    parser.add_argument("--threads", type=int, default=1, help="torch.set_num_threads")
+    parser.add_argument("--json", type=str, default=None, help="Write results as JSON to this path")
+    return parser.parse_args(argv)
+
+def fill_episode(agent, length, rng):
+    """Синтетический эпизод: случайные состояния в пределах поля 6x12."""
+    import numpy as np
+    for t in range(length):
+        left = int(rng.integers(0, 5))
+        state = np.array([rng.integers(0, 6), left, left + 1, rng.integers(0, 12)], dtype=np.float32)
+        agent.select_action(state)
+        agent.store_reward(1.0 if t % 12 == 11 else 0.0)
+
+def time_updates(agent, length, repeats, warmup, seed=0):
+    import numpy as np
+    rng = np.random.default_rng(seed)
+    times = []
+    for i in range(warmup + repeats):
+        fill_episode(agent, length, rng)
+        start = time.perf_counter()
+        agent.update_policy()
+        if i >= warmup:
+            times.append((time.perf_counter() - start) * 1000)
+    return statistics.median(times)
+
+def make_agent(mode: str):
+    """
+    eager — граф autograd на каждом шаге select_action; padded — тот же паддинг и
+    маска, что в compile-режиме, но без torch.compile; compiled — --compile.
+    Разница padded/compiled — вклад компиляции, eager/padded — вклад батчинга forward.
+    """
+    import torch
+    from src.agent.reinforce_agent import ReinforceAgent
+    from src.utils.config import AgentConfig
+
+    torch.manual_seed(0)
+    agent = ReinforceAgent(AgentConfig(use_normalization=True, compile_update=mode == "compiled"))
+    if mode == "padded":
+        # _loss_fn/_step_fn остаются некомпилированными
+        agent.compile_update = True
+    return agent
+
+def main(argv=None):
+    args = parse_args(argv)
+    import torch
+    from src.agent.reinforce_agent import ReinforceAgent
+
+    torch.set_num_threads(args.threads)
+    results = []
+    print(f"{'Length':>8}{'Bucket':>8}{'Eager (ms)':>12}{'Padded (ms)':>13}{'Compiled (ms)':>15}"
+          f"{'Padded vs eager':>17}{'Compiled vs padded':>20}")
+    for length in args.lengths:
+        eager = time_updates(make_agent("eager"), length, args.repeats, args.warmup)
+        padded = time_updates(make_agent("padded"), length, args.repeats, args.warmup)
+        compiled = time_updates(make_agent("compiled"), length, args.repeats, args.warmup)
+
+        bucket = ReinforceAgent.bucket_length(length)
+        results.append({"length": length, "bucket": bucket, "eager_ms": eager, "padded_eager_ms": padded,
+                        "compiled_ms": compiled, "speedup": eager / compiled,
+                        "padding_speedup": eager / padded, "compile_speedup": padded / compiled})
+        print(f"{length:>8}{bucket:>8}{eager:>12.2f}{padded:>13.2f}{compiled:>15.2f}"
+              f"{eager / padded:>16.2f}x{padded / compiled:>19.2f}x")
+
+    print("\nOnly update_policy is timed (eager select_action also builds per-step autograd graphs, not counted).")
+    print("Padded = compile-mode batching (one forward over the padded episode) without torch.compile.")
+
+    if args.json:
+        os.makedirs(os.path.dirname(args.json) or ".", exist_ok=True)
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"Results saved to {args.json}")
+
+if __name__ == "__main__":
+    main()
@@ -1,15 +1,8 @@
 import argparse
-import sys
+import json
 import os
-import torch
-sys.path.append(os.getcwd())
 
-from src.environment.game_env import GameEnv
-from src.agent.reinforce_agent import ReinforceAgent
-from src.utils.config import EnvConfig, AgentConfig, TrainConfig
-from src.utils.seed import set_global_seed
-
-def parse_args():
+def parse_args(argv=None):
     parser = argparse.ArgumentParser()
     parser.add_argument("--checkpoint", type=str, required=True, help="Path to checkpoint file")
     parser.add_argument("--num_episodes", type=int, default=100, help="Number of episodes to evaluate")
@@ -20,10 +13,43 @@ def parse_args():
     parser.add_argument("--norm", action="store_true", help="Use return normalization")
     parser.add_argument("--entropy", type=float, default=0.0, help="Entropy coefficient")
     parser.add_argument("--baseline", action="store_true", help="Use height-based analytic baseline")
-    return parser.parse_args()
+    # Последовательная оценка с ранней остановкой
+    parser.add_argument("--sequential", action="store_true",
+                        help="Stop early once confidence intervals are tight enough (num_episodes becomes the upper bound)")
+    parser.add_argument("--min_episodes", type=int, default=10, help="Minimum episodes before early stopping")
+    parser.add_argument("--confidence", type=float, default=0.95, help="Confidence level of the intervals")
+    parser.add_argument("--ci_width", type=float, default=50.0, help="Target CI width for survival steps")
+    parser.add_argument("--reward_ci_width", type=float, default=None, help="Target CI width for reward (optional)")
+    parser.add_argument("--reference", type=str, default=None,
+                        help="Reference steps: a JSON file written by --json (mean, std and n are used) or an exact number")
+    parser.add_argument("--reference_confidence", type=float, default=0.95,
+                        help="Overall confidence of the better/worse-than-reference stop, Bonferroni-corrected "
+                             "over all looks (false better/worse rate <= 1 - this)")
+    parser.add_argument("--json", type=str, default=None, help="Write results as JSON to this path")
+    return parser.parse_args(argv)
+
+
+def load_reference(reference: str | None) -> dict:
+    """
+    Reference задаётся JSON-файлом предыдущей оценки (берутся mean, std и n steps)
+    или числом, которое считается точным. Возвращает kwargs SequentialEvaluator.
+    """
+    if reference is None:
+        return {}
+    if os.path.exists(reference):
+        with open(reference) as f:
+            steps = json.load(f)["steps"]
+        return {"reference_steps": float(steps["mean"]), "reference_std": float(steps["std"]),
+                "reference_n": int(steps["n"])}
+    return {"reference_steps": float(reference)}
 
-def main():
-    args = parse_args()
+def main(argv=None):
+    args = parse_args(argv)
+    # Тяжёлые модули (torch) импортируются только после разбора аргументов
+    from src.agent.reinforce_agent import ReinforceAgent
+    from src.utils.config import EnvConfig, AgentConfig, TrainConfig
+    from src.utils.seed import set_global_seed
+    from src.training.evaluation import SequentialEvaluator
     
     # Setup
     set_global_seed(args.seed)
@@ -31,13 +57,12 @@ def main():
     agent_cfg = AgentConfig(use_normalization=args.norm, entropy_coef=args.entropy, use_height_baseline=args.baseline)
     train_cfg = TrainConfig()
     
-    # Create environment and agent
-    env = GameEnv(env_cfg, args.seed)
+    # Create agent (эпизоды оценки создают свои среды из потоков seed'а)
     agent = ReinforceAgent(agent_cfg)
     
     # Set grid height and state mode on agent for baseline computation (same as in Trainer)
-    agent.grid_height = env.cfg.grid_height
-    agent.state_mode = env.cfg.state_mode
+    agent.grid_height = env_cfg.grid_height
+    agent.state_mode = env_cfg.state_mode
     
     # Load checkpoint
     if not os.path.exists(args.checkpoint):
@@ -48,51 +73,49 @@ def main():
     print(f"Loaded checkpoint: {args.checkpoint}")
     
     # Evaluation
-    total_rewards = []
-    total_steps = []
-    
-    print(f"\nEvaluating agent for {args.num_episodes} episodes...")
-    
-    for episode in range(args.num_episodes):
-        state = env.reset()
-        done = False
-        episode_reward = 0.0
-        episode_steps = 0
-        
-        while not done:
-            with torch.no_grad():
-                action = agent.select_action(state)
-                agent.clear_buffers()
-            
-            state, reward, done, _ = env.step(action)
-            episode_reward += reward
-            episode_steps += 1
-            
-            if episode_steps >= train_cfg.max_steps_per_episode:
-                done = True
-        
-        total_rewards.append(episode_reward)
-        total_steps.append(episode_steps)
-        
-        if (episode + 1) % 10 == 0:
-            avg_reward = sum(total_rewards[-10:]) / 10
-            avg_steps = sum(total_steps[-10:]) / 10
-            print(f"Episode {episode + 1}/{args.num_episodes} | Avg Reward: {avg_reward:.2f} | Avg Steps: {avg_steps:.1f}")
-    
+    if args.sequential:
+        evaluator = SequentialEvaluator(
+            max_episodes=args.num_episodes,
+            min_episodes=args.min_episodes,
+            confidence=args.confidence,
+            steps_ci_width=args.ci_width,
+            reward_ci_width=args.reward_ci_width,
+            reference_confidence=args.reference_confidence,
+            **load_reference(args.reference),
+        )
+    else:
+        evaluator = SequentialEvaluator(max_episodes=args.num_episodes, confidence=args.confidence)
+
+    def on_episode(n, reward, steps):
+        if n % 10 == 0:
+            low, high = evaluator.steps.confidence_interval(args.confidence)
+            print(f"Episode {n}/{args.num_episodes} | Avg Reward: {evaluator.rewards.mean:.2f} | "
+                  f"Avg Steps: {evaluator.steps.mean:.1f} [{low:.1f}, {high:.1f}]")
+
+    print(f"\nEvaluating agent for {'up to ' if args.sequential else ''}{args.num_episodes} episodes...")
+    results = evaluator.run(agent, env_cfg, train_cfg.max_steps_per_episode, args.seed, on_episode=on_episode)
+    results["checkpoint"] = args.checkpoint
+    results["seed"] = args.seed
+
     # Final statistics
-    avg_reward = sum(total_rewards) / len(total_rewards)
-    avg_steps = sum(total_steps) / len(total_steps)
-    max_reward = max(total_rewards)
-    min_reward = min(total_rewards)
-    
+    steps, rewards = results["steps"], results["reward"]
     print(f"\n{'='*50}")
     print(f"Evaluation Results:")
-    print(f"  Episodes: {args.num_episodes}")
-    print(f"  Average Reward: {avg_reward:.2f}")
-    print(f"  Max Reward: {max_reward:.2f}")
-    print(f"  Min Reward: {min_reward:.2f}")
-    print(f"  Average Steps: {avg_steps:.1f}")
+    print(f"  Episodes: {results['episodes']} (stop: {results['stop_reason']})")
+    print(f"  Average Reward: {rewards['mean']:.2f}")
+    print(f"  Max Reward: {rewards['max']:.2f}")
+    print(f"  Min Reward: {rewards['min']:.2f}")
+    print(f"  Average Steps: {steps['mean']:.1f}")
+    if steps["ci_low"] is not None:
+        print(f"  Steps {args.confidence:.0%} CI: [{steps['ci_low']:.1f}, {steps['ci_high']:.1f}]")
+        print(f"  Reward {args.confidence:.0%} CI: [{rewards['ci_low']:.2f}, {rewards['ci_high']:.2f}]")
     print(f"{'='*50}")
 
+    if args.json:
+        os.makedirs(os.path.dirname(args.json) or ".", exist_ok=True)
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"Results saved to {args.json}")
+
 if __name__ == "__main__":
     main()
@@ -1,5 +1,5 @@
 #!/bin/bash
-python run/evaluate.py \
+python -m src evaluate \
     --checkpoint artifacts/checkpoints/best.pt \
     --num_episodes 100 \
     --render
\ No newline at end of file
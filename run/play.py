@@ -1,24 +1,15 @@
 import argparse
-import pygame
-import torch
-import sys
 import os
 import time
 
-sys.path.append(os.getcwd())
-
-from src.environment.game_env import GameEnv
-from src.environment.renderer import GameRenderer
-from src.agent.reinforce_agent import ReinforceAgent
-from src.utils.config import EnvConfig, RenderConfig, AgentConfig
-
-def parse_args():
+def parse_args(argv=None):
     parser = argparse.ArgumentParser()
     parser.add_argument("--mode", choices=["human", "agent"], default="human")
     parser.add_argument("--model", default="best.pt")
-    return parser.parse_args()
+    return parser.parse_args(argv)
 
 def play_human(env, renderer):
+    import pygame
     running = True
     while running:
         env.reset()
@@ -39,6 +30,7 @@ def play_human(env, renderer):
     renderer.close()
 
 def play_agent(env, renderer, agent):
+    import torch
     running = True
     while running:
         state = env.reset()
@@ -62,6 +54,7 @@ def play_agent(env, renderer, agent):
     renderer.close()
 
 def show_game_over(renderer, score):
+    import pygame
     waiting = True
     while waiting:
         renderer.render_menu(int(score))
@@ -72,8 +65,13 @@ def show_game_over(renderer, score):
                 if event.key == pygame.K_q: return False
     return False
 
-def main():
-    args = parse_args()
+def main(argv=None):
+    args = parse_args(argv)
+    # pygame нужен в обоих режимах, torch — только в режиме agent
+    from src.environment.game_env import GameEnv
+    from src.environment.renderer import GameRenderer
+    from src.utils.config import EnvConfig, RenderConfig, AgentConfig
+
     e_cfg = EnvConfig()
     r_cfg = RenderConfig()
     a_cfg = AgentConfig()
@@ -85,6 +83,7 @@ def main():
     if args.mode == "human":
         play_human(env, renderer)
     else:
+        from src.agent.reinforce_agent import ReinforceAgent
         agent = ReinforceAgent(a_cfg)
         if args.model.startswith("artifacts/"):
             ckpt_path = args.model
@@ -1,29 +1,33 @@
-import pygame
-import torch
-import sys
+import argparse
 import os
-import imageio
-import numpy as np
 
-sys.path.append(os.getcwd())
 
-from src.environment.game_env import GameEnv
-from src.environment.renderer import GameRenderer
-from src.agent.reinforce_agent import ReinforceAgent
-from src.utils.config import EnvConfig, RenderConfig, AgentConfig
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--episodes", type=int, default=10, help="Number of GIFs to record (seeds 0..N-1)")
+    parser.add_argument("--model", default="artifacts/checkpoints/best.pt", help="Path to checkpoint file")
+    return parser.parse_args(argv)
 
 
 def capture_frame(renderer):
+    import numpy as np
+    import pygame
     frame = pygame.surfarray.array3d(renderer.screen)
     return np.transpose(frame, (1, 0, 2))
 
 
-def main(number):
+def record_episode(number, model_path="artifacts/checkpoints/best.pt"):
+    import imageio
+    import torch
+    from src.environment.game_env import GameEnv
+    from src.environment.renderer import GameRenderer
+    from src.agent.reinforce_agent import ReinforceAgent
+    from src.utils.config import EnvConfig, RenderConfig, AgentConfig
+
     env = GameEnv(EnvConfig(), seed=number)
     renderer = GameRenderer(EnvConfig(), RenderConfig())
     agent = ReinforceAgent(AgentConfig())
 
-    model_path = "artifacts/checkpoints/best.pt"
     if not os.path.exists(model_path):
         print(f"Model not found: {model_path}")
         return
@@ -60,6 +64,11 @@ def main(number):
         print(f"GIF saved: {gif_path} | {len(frames)} frames | score: {int(total_score)}")
 
 
+def main(argv=None):
+    args = parse_args(argv)
+    for i in range(args.episodes):
+        record_episode(i, args.model)
+
+
 if __name__ == "__main__":
-    for i in range(10):
-        main(i)
\ No newline at end of file
+    main()
\ No newline at end of file
@@ -0,0 +1,42 @@
+import argparse
+import time
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--checkpoint", type=str, default="artifacts/checkpoints/best.pt", help="Path to checkpoint file")
+    parser.add_argument("--socket", type=str, default=None, help="Unix socket path (default: TCP on --host/--port)")
+    parser.add_argument("--host", type=str, default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=5555)
+    parser.add_argument("--max_batch", type=int, default=64, help="Maximum micro-batch size")
+    parser.add_argument("--max_delay_ms", type=float, default=2.0, help="Latency budget for filling a micro-batch")
+    parser.add_argument("--greedy", action="store_true", help="Return argmax actions instead of sampling")
+    parser.add_argument("--seed", type=int, default=None, help="Seed of the action sampler")
+    parser.add_argument("--stats_every", type=float, default=10.0, help="Print server stats every N seconds (0 = off)")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    # torch импортируется только после разбора аргументов
+    from src.agent.inference_server import InferenceServer
+
+    address = args.socket or (args.host, args.port)
+    server = InferenceServer(args.checkpoint, address, max_batch=args.max_batch,
+                             max_delay_ms=args.max_delay_ms, greedy=args.greedy, seed=args.seed)
+    server.start()
+    print(f"Serving {args.checkpoint} on {server.address} (max_batch={args.max_batch}, max_delay={args.max_delay_ms}ms)")
+
+    try:
+        while True:
+            time.sleep(args.stats_every or 3600)
+            if args.stats_every:
+                s = server.stats()
+                lat = s["latency_ms"]
+                print(f"Requests: {s['requests']} | Batches: {s['batches']} | Mean batch: {s['mean_batch_size']:.1f} | "
+                      f"Queue: {s['queue_depth']} | p50/p99: {lat.get('p50', 0):.2f}/{lat.get('p99', 0):.2f} ms")
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+import argparse
+import glob
+import json
+import os
+import time
+
+STATE_MODES = ("absolute", "relative")
+REWARD_MODES = ("basic", "enhanced")
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--checkpoints", nargs="+", required=True,
+                        help="Checkpoint paths or glob patterns, optionally with the env modes they were trained on: "
+                             "'path[:state[:reward]]', e.g. 'artifacts/ablation/3_*/checkpoints/best.pt:relative:basic'")
+    parser.add_argument("--num_episodes", type=int, default=100, help="Matched episodes per checkpoint")
+    parser.add_argument("--seed", type=int, default=42, help="Seed of the matched env/sampling streams")
+    parser.add_argument("--state", choices=STATE_MODES, default="absolute",
+                        help="State mode of checkpoints given without one")
+    parser.add_argument("--reward", choices=REWARD_MODES, default="basic",
+                        help="Reward mode of checkpoints given without one")
+    parser.add_argument("--confidence", type=float, default=0.95, help="Confidence level of the intervals")
+    parser.add_argument("--json", type=str, default=None, help="Write the ranked table as JSON to this path")
+    return parser.parse_args(argv)
+
+def parse_spec(spec: str, state: str, reward: str) -> tuple[str, str, str]:
+    """'path[:state[:reward]]' -> (path, state, reward); недостающие режимы — по умолчанию."""
+    path, *modes = spec.split(":")
+    state = modes[0] if len(modes) > 0 else state
+    reward = modes[1] if len(modes) > 1 else reward
+    if len(modes) > 2 or state not in STATE_MODES or reward not in REWARD_MODES:
+        raise ValueError(f"Bad checkpoint spec {spec!r}: expected path[:{'|'.join(STATE_MODES)}[:{'|'.join(REWARD_MODES)}]]")
+    return path, state, reward
+
+def expand_checkpoints(specs: list[str], state: str, reward: str) -> list[tuple[str, str, str]]:
+    """Раскрывает glob'ы; каждый чекпоинт получает режимы своей спецификации."""
+    entries = []
+    for spec in specs:
+        pattern, spec_state, spec_reward = parse_spec(spec, state, reward)
+        for path in sorted(glob.glob(pattern)) or [pattern]:
+            if (path, spec_state, spec_reward) not in entries:
+                entries.append((path, spec_state, spec_reward))
+    return entries
+
+def group_by_env(entries: list[tuple[str, str, str]]) -> dict[tuple[str, str], list[str]]:
+    """
+    Чекпоинты с разными state/reward нельзя складывать в один стек: наблюдения
+    одной размерности, но разного смысла, а награды — разного масштаба.
+    Турнир и ранжирование идут отдельно внутри каждой группы.
+    """
+    groups = {}
+    for path, state, reward in entries:
+        groups.setdefault((state, reward), []).append(path)
+    return groups
+
+def main(argv=None):
+    args = parse_args(argv)
+    # Тяжёлые модули (torch) импортируются только после разбора аргументов
+    import torch
+    from src.agent.stacked_policy import StackedPolicyNetwork
+    from src.training.tournament import run_tournament, rank_results
+    from src.utils.config import EnvConfig, TrainConfig
+
+    torch.set_num_threads(1)
+
+    try:
+        entries = expand_checkpoints(args.checkpoints, args.state, args.reward)
+    except ValueError as e:
+        print(f"Error: {e}")
+        return
+    missing = [p for p, _, _ in entries if not os.path.exists(p)]
+    if missing:
+        print(f"Error: Checkpoint files not found: {missing}")
+        return
+
+    groups = group_by_env(entries)
+    if len(groups) > 1:
+        print(f"Checkpoints use {len(groups)} different env configs; ranking each group separately")
+
+    train_cfg = TrainConfig()
+    results = []
+    for (state, reward), paths in groups.items():
+        state_dicts = [torch.load(p, map_location="cpu") for p in paths]
+        policy = StackedPolicyNetwork.from_state_dicts(state_dicts)
+        env_cfg = EnvConfig(state_mode=state, reward_mode=reward)
+
+        start = time.perf_counter()
+        rewards, steps = run_tournament(policy, env_cfg, args.num_episodes, train_cfg.max_steps_per_episode, args.seed)
+        elapsed = time.perf_counter() - start
+        table = rank_results(paths, rewards, steps, args.confidence)
+        results.append({"state_mode": state, "reward_mode": reward, "ranking": table})
+
+        print(f"\n{'='*100}")
+        print(f"Tournament (state={state}, reward={reward}): {len(paths)} checkpoints x "
+              f"{args.num_episodes} matched episodes ({elapsed:.1f}s)")
+        print(f"{'Rank':>4}  {'Avg Steps':>10}  {'Avg Reward':>10}  {'Diff vs #1 [CI]':>24}  {'W/T/L vs #1':>15}  Checkpoint")
+        for row in table:
+            d = row["vs_leader"]
+            diff = d["steps_diff"]
+            ci = f"[{diff['ci_low']:.1f}, {diff['ci_high']:.1f}]" if diff["ci_low"] is not None else ""
+            wtl = f"{d['win_rate']:.2f}/{d['tie_rate']:.2f}/{d['loss_rate']:.2f}"
+            print(f"{row['rank']:>4}  {row['steps']['mean']:>10.1f}  {row['reward']['mean']:>10.2f}  "
+                  f"{diff['mean']:>8.1f} {ci:>15}  {wtl:>15}  {row['name']}")
+        print(f"{'='*100}")
+
+    if args.json:
+        os.makedirs(os.path.dirname(args.json) or ".", exist_ok=True)
+        with open(args.json, "w") as f:
+            json.dump({"num_episodes": args.num_episodes, "seed": args.seed, "groups": results}, f, indent=2)
+        print(f"Results saved to {args.json}")
+
+if __name__ == "__main__":
+    main()
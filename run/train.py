@@ -1,16 +1,6 @@
 import argparse
-import sys
-import os
-sys.path.append(os.getcwd())
-
-from src.environment.game_env import GameEnv
-from src.agent.reinforce_agent import ReinforceAgent
-from src.training.trainer import Trainer
-from src.training.logger import Logger
-from src.utils.config import EnvConfig, AgentConfig, TrainConfig
-from src.utils.seed import set_global_seed
-
-def parse_args():
+
+def parse_args(argv=None):
     parser = argparse.ArgumentParser()
     parser.add_argument("--name", type=str, default="baseline", help="Experiment name")
     parser.add_argument("--norm", action="store_true", help="Use return normalization")
@@ -20,36 +10,72 @@ def parse_args():
     parser.add_argument("--reward", choices=["basic", "enhanced"], default="basic")
     parser.add_argument("--episodes", type=int, default=800)
     parser.add_argument("--seed", type=int, default=42, help="Seed")
-    return parser.parse_args()
+    parser.add_argument("--max_steps", type=int, default=2000, help="Max steps per episode")
+    parser.add_argument("--truncate_steps", type=int, default=0,
+                        help="Update every N steps on a bootstrapped episode chunk (0 = once per episode; "
+                             "the bootstrap is 0 with --reward enhanced)")
+    parser.add_argument("--compile", action="store_true",
+                        help="Compile update_policy with torch.compile (falls back to eager on failure)")
+    parser.add_argument("--reuse_epochs", type=int, default=0,
+                        help="Clipped importance-weighted epochs over recent episodes per update (0 = plain REINFORCE)")
+    parser.add_argument("--reuse_buffer", type=int, default=4, help="Episodes kept for --reuse_epochs")
+    parser.add_argument("--eval_every", type=int, default=0,
+                        help="Evaluate a weight snapshot in a background process every N episodes (0 = off)")
+    parser.add_argument("--eval_episodes", type=int, default=10, help="Fixed-seed episodes per background evaluation")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    # Тяжёлые модули (torch) импортируются только после разбора аргументов
+    from src.environment.game_env import GameEnv
+    from src.agent.reinforce_agent import ReinforceAgent
+    from src.training.trainer import Trainer
+    from src.training.logger import Logger
+    from src.training.evaluation import AsyncEvaluator
+    from src.utils.config import EnvConfig, AgentConfig, TrainConfig
+    from src.utils.seed import set_global_seed, training_seeds
+    import torch
 
-def main():
-    args = parse_args()
     # Инициализация конфигов с учетом аргументов
-    env_cfg = EnvConfig(state_mode=args.state, reward_mode=args.reward)
-    agent_cfg = AgentConfig(use_normalization=args.norm, entropy_coef=args.entropy, use_height_baseline=args.baseline)
+    env_cfg = EnvConfig(state_mode=args.state, reward_mode=args.reward, seed=args.seed)
+    agent_cfg = AgentConfig(use_normalization=args.norm, entropy_coef=args.entropy, use_height_baseline=args.baseline,
+                            compile_update=args.compile, reuse_epochs=args.reuse_epochs,
+                            reuse_buffer_size=args.reuse_buffer, truncate_steps=args.truncate_steps)
     
     # Настройка путей для эксперимента
     train_cfg = TrainConfig(
         num_episodes=args.episodes,
+        max_steps_per_episode=args.max_steps,
         exp_name=args.name,
         stats_path=f"artifacts/ablation/{args.name}/stats.csv",
-        checkpoint_dir=f"artifacts/ablation/{args.name}/checkpoints"
+        checkpoint_dir=f"artifacts/ablation/{args.name}/checkpoints",
+        eval_every=args.eval_every,
+        eval_episodes=args.eval_episodes,
+        seed=args.seed,
     )
 
     print(f"\n>>> Running Experiment: {args.name}")
     print(f"Configs: Norm={args.norm}, Entropy={args.entropy}, Baseline={args.baseline}, State={args.state}, Reward={args.reward}")
 
-    set_global_seed(args.seed)
-    env_cfg.seed = args.seed
-
-    env = GameEnv(env_cfg, args.seed)
+    # Веса — из root seed, среда и семплирование действий — из своих дочерних потоков
+    set_global_seed(train_cfg.seed)
     agent = ReinforceAgent(agent_cfg)
+    env_seed, sampler_seed = training_seeds(train_cfg.seed)
+    torch.manual_seed(sampler_seed)
+    env = GameEnv(env_cfg, env_seed)
     logger = Logger(train_cfg.stats_path)
-    trainer = Trainer(env, agent, train_cfg, logger)
+
+    evaluator = None
+    if train_cfg.eval_every > 0:
+        evaluator = AsyncEvaluator(env_cfg, agent_cfg, train_cfg.eval_episodes,
+                                   train_cfg.max_steps_per_episode, train_cfg.seed)
+    trainer = Trainer(env, agent, train_cfg, logger, evaluator=evaluator)
 
     try:
         trainer.train()
     finally:
+        if evaluator is not None:
+            evaluator.close()
         logger.close()
 
 if __name__ == "__main__":
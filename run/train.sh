@@ -1,2 +1,2 @@
 #!/bin/bash
-python run/train.py --name 0_original --state absolute --reward basic --episodes 10000 --seed 42
\ No newline at end of file
+python -m src train --name 0_original --state absolute --reward basic --episodes 10000 --seed 42
\ No newline at end of file
@@ -0,0 +1,93 @@
+import argparse
+
+def parse_seeds(values: list[str]) -> list[int]:
+    """Принимает список seed'ов и диапазоны вида 1-20."""
+    seeds = []
+    for v in values:
+        if "-" in v:
+            lo, hi = v.split("-")
+            seeds.extend(range(int(lo), int(hi) + 1))
+        else:
+            seeds.append(int(v))
+    return seeds
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--name", type=str, default="baseline", help="Experiment name (per-seed runs get a _seed<N> suffix)")
+    parser.add_argument("--norm", action="store_true", help="Use return normalization")
+    parser.add_argument("--entropy", type=float, default=0.0, help="Entropy coefficient")
+    parser.add_argument("--baseline", action="store_true", help="Use height-based analytic baseline")
+    parser.add_argument("--state", choices=["absolute", "relative"], default="absolute")
+    parser.add_argument("--reward", choices=["basic", "enhanced"], default="basic")
+    parser.add_argument("--episodes", type=int, default=800)
+    parser.add_argument("--seeds", nargs="+", default=["1-20"], help="Seeds, e.g. '1-20' or '1 5 7'")
+    parser.add_argument("--workers", type=int, default=0,
+                        help="Env worker processes (0 = step envs in this process)")
+    parser.add_argument("--watch", action="store_true",
+                        help="Show all envs tiled in one window (requires --workers 0)")
+    parser.add_argument("--watch_fps", type=float, default=5.0, help="Redraw rate of the --watch window")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.watch and args.workers > 0:
+        raise SystemExit("--watch needs the envs in this process; use --workers 0")
+    # Тяжёлые модули (torch) импортируются только после разбора аргументов
+    from src.environment.vector_env import SyncVectorEnv, SubprocVectorEnv
+    from src.agent.reinforce_agent import ReinforceAgent
+    from src.training.ensemble_trainer import EnsembleTrainer
+    from src.training.logger import Logger
+    from src.utils.config import EnvConfig, AgentConfig, TrainConfig
+    from src.utils.seed import set_global_seed, torch_generator, training_seeds
+
+    seeds = parse_seeds(args.seeds)
+    env_cfg = EnvConfig(state_mode=args.state, reward_mode=args.reward)
+    agent_cfg = AgentConfig(use_normalization=args.norm, entropy_coef=args.entropy, use_height_baseline=args.baseline)
+
+    print(f"\n>>> Running Ensemble Experiment: {args.name} (seeds: {seeds})")
+    print(f"Configs: Norm={args.norm}, Entropy={args.entropy}, Baseline={args.baseline}, State={args.state}, Reward={args.reward}")
+
+    agents, train_cfgs, loggers, generators = [], [], [], []
+    for seed in seeds:
+        name = f"{args.name}_seed{seed}"
+        train_cfgs.append(TrainConfig(
+            num_episodes=args.episodes,
+            exp_name=name,
+            stats_path=f"artifacts/ablation/{name}/stats.csv",
+            checkpoint_dir=f"artifacts/ablation/{name}/checkpoints"
+        ))
+
+        # Те же потоки, что в run/train.py: старт как у отдельного запуска с этим seed,
+        # дальше — статистически эквивалентно, но не бит в бит (см. EnsembleTrainer)
+        set_global_seed(seed)
+        agents.append(ReinforceAgent(agent_cfg))
+        generators.append(torch_generator(training_seeds(seed)[1]))
+        loggers.append(Logger(train_cfgs[-1].stats_path, verbose=False))
+
+    env_seeds = [training_seeds(seed)[0] for seed in seeds]
+    if args.workers > 0:
+        vec_env = SubprocVectorEnv(env_cfg, env_seeds, num_workers=args.workers, autoreset=False)
+    else:
+        vec_env = SyncVectorEnv(env_cfg, env_seeds, autoreset=False)
+    monitor = None
+    if args.watch:
+        from src.environment.renderer import TiledRenderer
+        from src.utils.config import RenderConfig
+        monitor = TiledRenderer(env_cfg, RenderConfig(), len(seeds), max_fps=args.watch_fps)
+    trainer = EnsembleTrainer(vec_env, agents, train_cfgs, loggers, generators, monitor=monitor)
+
+    try:
+        results = trainer.train()
+    finally:
+        vec_env.close()
+        if monitor is not None:
+            monitor.close()
+        for logger in loggers:
+            logger.close()
+
+    for seed, res in zip(seeds, results):
+        status = "early stop" if res["early_stopped"] else "max episodes"
+        print(f"Seed {seed}: {res['episodes']} episodes ({status})")
+
+if __name__ == "__main__":
+    main()
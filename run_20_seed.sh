@@ -22,7 +22,7 @@ for seed in {1..20}; do
     
     # Обучение без baseline
     echo "Training 0_original (seed=$seed)..."
-    python run/train.py --name "benchmark_0_original_seed${seed}" \
+    python -m src train --name "benchmark_0_original_seed${seed}" \
         --state absolute --reward basic \
         --episodes 10000 --seed $seed > /dev/null 2>&1
     
@@ -39,7 +39,7 @@ for seed in {1..20}; do
     
     # Обучение с baseline
     echo "Training 1_with_baseline (seed=$seed)..."
-    python run/train.py --name "benchmark_1_with_baseline_seed${seed}" \
+    python -m src train --name "benchmark_1_with_baseline_seed${seed}" \
         --state absolute --reward basic --baseline \
         --episodes 10000 --seed $seed > /dev/null 2>&1
     
@@ -0,0 +1,276 @@
+import json
+import os
+import queue
+import socket
+import socketserver
+import stat
+import threading
+import time
+from collections import deque
+import numpy as np
+import torch
+from src.agent.policy_network import PolicyNetwork
+from src.utils.seed import sample_actions
+
+
+def load_policy(path: str) -> PolicyNetwork:
+    """
+    Загружает PolicyNetwork из чекпоинта, размеры берутся из весов.
+    weights_only=True: путь приходит от клиента (reload), а до torch 2.6 torch.load
+    по умолчанию распаковывает произвольный pickle.
+    """
+    state_dict = torch.load(path, map_location="cpu", weights_only=True)
+    hidden_dim, state_dim = state_dict["net.0.weight"].shape
+    action_dim = state_dict["net.4.weight"].shape[0]
+    policy = PolicyNetwork(state_dim, hidden_dim, action_dim)
+    policy.load_state_dict(state_dict)
+    policy.eval()
+    return policy
+
+
+def _remove_socket(path: str) -> None:
+    """Удаляет Unix socket по пути; обычный файл (например, опечатка в --socket) не трогает."""
+    try:
+        mode = os.lstat(path).st_mode
+    except FileNotFoundError:
+        return
+    if not stat.S_ISSOCK(mode):
+        raise FileExistsError(f"{path} exists and is not a socket")
+    os.unlink(path)
+
+
+class _Request:
+    __slots__ = ("state", "created", "event", "action", "probs", "error")
+
+    def __init__(self, state) -> None:
+        self.state = state
+        self.created = time.perf_counter()
+        self.event = threading.Event()
+        self.action = None
+        self.probs = None
+        self.error = None
+
+
+class InferenceServer:
+    """
+    Локальный сервер инференса политики (Unix socket или TCP на localhost).
+    Протокол — JSON по строкам:
+      {"state": [...]}                -> {"action": a, "probs": [...]}
+      {"cmd": "reload", "path": "..."} -> {"ok": true}
+      {"cmd": "stats"}                -> очередь, размеры батчей, перцентили задержки
+    Одиночные запросы от разных клиентов собираются в micro-batch: батч уходит в
+    forward, когда набралось max_batch запросов или истёк max_delay_ms с первого.
+    """
+
+    def __init__(
+        self,
+        checkpoint: str,
+        address,
+        max_batch: int = 64,
+        max_delay_ms: float = 2.0,
+        greedy: bool = False,
+        seed: int | None = None,
+    ) -> None:
+        self.policy = load_policy(checkpoint)
+        self.checkpoint = checkpoint
+        self.state_dim = self.policy.net[0].in_features
+        self.address = address
+        self.max_batch = max_batch
+        self.max_delay = max_delay_ms / 1000.0
+        self.greedy = greedy
+        self.generator = torch.Generator()
+        if seed is not None:
+            self.generator.manual_seed(seed)
+
+        self._queue = queue.Queue()
+        self._latencies = deque(maxlen=10_000)
+        self._requests = 0
+        self._batches = 0
+        self._running = False
+        self._server = None
+        self._threads = []
+
+    # --- Батчинг ---
+
+    def _collect_batch(self) -> list:
+        try:
+            first = self._queue.get(timeout=0.1)
+        except queue.Empty:
+            return []
+        batch = [first]
+        deadline = first.created + self.max_delay
+        while len(batch) < self.max_batch:
+            timeout = deadline - time.perf_counter()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=timeout))
+            except queue.Empty:
+                break
+        return batch
+
+    def _batch_loop(self) -> None:
+        torch.set_num_threads(1)
+        while self._running:
+            batch = self._collect_batch()
+            if not batch:
+                continue
+            policy = self.policy  # hot reload подменяет ссылку целиком
+            try:
+                states = torch.from_numpy(np.stack([r.state for r in batch]))
+                with torch.no_grad():
+                    probs = policy(states)
+                if self.greedy:
+                    actions = probs.argmax(dim=-1)
+                else:
+                    # Тот же inverse-CDF семплер, что при обучении и оценке;
+                    # по одному равномерному числу на запрос батча
+                    u = torch.rand(len(batch), generator=self.generator)
+                    actions = sample_actions(probs, u=u)
+            except Exception as e:
+                # Ошибка батча не должна останавливать batcher: каждый запрос получает её
+                for r in batch:
+                    r.error = f"{type(e).__name__}: {e}"
+                    r.event.set()
+                continue
+
+            now = time.perf_counter()
+            for r, a, p in zip(batch, actions.tolist(), probs.tolist()):
+                r.action, r.probs = a, p
+                self._latencies.append(now - r.created)
+                r.event.set()
+            self._requests += len(batch)
+            self._batches += 1
+
+    def infer(self, state) -> tuple[int, list[float]]:
+        """
+        Ставит состояние (np.float32, shape (state_dim,), проверено в handle) в очередь
+        и ждёт ответа (используется обработчиками соединений).
+        """
+        request = _Request(state)
+        self._queue.put(request)
+        request.event.wait()
+        if request.error is not None:
+            raise RuntimeError(request.error)
+        return request.action, request.probs
+
+    # --- Управление ---
+
+    def reload(self, path: str) -> None:
+        """Загружает новый чекпоинт; запросы в работе дообслуживаются старой моделью."""
+        policy = load_policy(path)
+        if policy.net[0].in_features != self.state_dim:
+            raise ValueError(f"checkpoint state_dim {policy.net[0].in_features} != {self.state_dim}")
+        self.policy = policy
+        self.checkpoint = path
+
+    def stats(self) -> dict:
+        latencies = np.asarray(self._latencies, dtype=np.float64) * 1000
+        percentiles = {}
+        if len(latencies):
+            for q in (50, 90, 99):
+                percentiles[f"p{q}"] = float(np.percentile(latencies, q))
+        return {
+            "checkpoint": self.checkpoint,
+            "queue_depth": self._queue.qsize(),
+            "requests": self._requests,
+            "batches": self._batches,
+            "mean_batch_size": self._requests / self._batches if self._batches else 0.0,
+            "latency_ms": percentiles,
+        }
+
+    def handle(self, message: dict) -> dict:
+        if "state" in message:
+            # Проверка до постановки в очередь: плохой запрос не должен ронять
+            # micro-batch, в котором окажутся запросы других клиентов
+            try:
+                state = np.asarray(message["state"], dtype=np.float32)
+            except (TypeError, ValueError):
+                state = None
+            if state is None or state.shape != (self.state_dim,) or not np.isfinite(state).all():
+                return {"error": f"state must be a list of {self.state_dim} finite numbers"}
+            action, probs = self.infer(state)
+            return {"action": action, "probs": probs}
+        cmd = message.get("cmd")
+        if cmd == "reload":
+            self.reload(message["path"])
+            return {"ok": True, "checkpoint": self.checkpoint}
+        if cmd == "stats":
+            return self.stats()
+        return {"error": f"unknown message: {message}"}
+
+    def start(self) -> None:
+        """Запускает batcher и сокет-сервер в фоновых потоках."""
+        server = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self):
+                for line in self.rfile:
+                    try:
+                        reply = server.handle(json.loads(line))
+                    except Exception as e:
+                        reply = {"error": str(e)}
+                    self.wfile.write((json.dumps(reply) + "\n").encode())
+
+        if isinstance(self.address, str):
+            _remove_socket(self.address)
+            base_cls = socketserver.ThreadingUnixStreamServer
+        else:
+            base_cls = socketserver.ThreadingTCPServer
+
+        class Server(base_cls):
+            daemon_threads = True
+
+        self._server = Server(self.address, Handler)
+        self.address = self._server.server_address
+
+        self._running = True
+        self._threads = [
+            threading.Thread(target=self._batch_loop, daemon=True),
+            threading.Thread(target=self._server.serve_forever, daemon=True),
+        ]
+        for t in self._threads:
+            t.start()
+
+    def stop(self) -> None:
+        self._running = False
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            if isinstance(self.address, str):
+                _remove_socket(self.address)
+        for t in self._threads:
+            t.join(timeout=1.0)
+
+
+class InferenceClient:
+    """Клиент InferenceServer: одно соединение, запросы по одному."""
+
+    def __init__(self, address) -> None:
+        family = socket.AF_UNIX if isinstance(address, str) else socket.AF_INET
+        self.sock = socket.socket(family, socket.SOCK_STREAM)
+        self.sock.connect(address)
+        if family == socket.AF_INET:
+            self.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self.file = self.sock.makefile("rwb")
+
+    def request(self, message: dict) -> dict:
+        self.file.write((json.dumps(message) + "\n").encode())
+        self.file.flush()
+        return json.loads(self.file.readline())
+
+    def select_action(self, state) -> tuple[int, list[float]]:
+        reply = self.request({"state": [float(x) for x in state]})
+        if "error" in reply:
+            raise RuntimeError(reply["error"])
+        return reply["action"], reply["probs"]
+
+    def reload(self, path: str) -> dict:
+        return self.request({"cmd": "reload", "path": path})
+
+    def stats(self) -> dict:
+        return self.request({"cmd": "stats"})
+
+    def close(self) -> None:
+        self.file.close()
+        self.sock.close()
@@ -1,8 +1,10 @@
+import warnings
 import torch
 import numpy as np
 from torch.distributions import Categorical
 from collections import deque
 from src.agent.policy_network import PolicyNetwork 
+from src.utils.seed import sample_actions
 
 class ReinforceAgent:
     def __init__(self, config) -> None:
@@ -15,16 +17,41 @@ class ReinforceAgent:
         # Настройки среды (уточняются тренером)
         self.grid_height = 12  
         self.state_mode = "absolute"
+        self.reward_mode = "basic"
         
         self.device = torch.device("cpu")
         self.policy = PolicyNetwork(config.state_dim, config.hidden_dim, config.action_dim).to(self.device)
         self.optimizer = torch.optim.Adam(self.policy.parameters(), lr=self.lr)
 
+        # Компилированный шаг обучения (forward + loss + backward + clip + Adam)
+        # на паддинге до фиксированных длин; при ошибке компиляции — eager
+        self.compile_update = getattr(config, "compile_update", False)
+        self._loss_fn = self._masked_loss
+        self._step_fn = self._clip_and_step
+        if self.compile_update:
+            self._loss_fn = torch.compile(self._masked_loss, dynamic=False)
+            self._step_fn = torch.compile(self._clip_and_step)
+
+        # Повторное использование эпизодов: несколько эпох clipped importance-weighted
+        # шагов по буферу последних эпизодов (0 — обычный REINFORCE)
+        self.reuse_epochs = getattr(config, "reuse_epochs", 0)
+        self.clip_ratio = getattr(config, "clip_ratio", 0.2)
+        self.max_kl = getattr(config, "max_kl", 0.02)
+        self.replay = deque(maxlen=getattr(config, "reuse_buffer_size", 4))
+
+        # Усечённые обновления: шаг обучения каждые truncate_steps шагов эпизода,
+        # хвост отрезка оценивается аналитическим V(h) (0 — обновление раз в эпизод);
+        # V(h) выведен для basic-наград, при enhanced bootstrap равен 0
+        self.truncate_steps = getattr(config, "truncate_steps", 0)
+        self.truncate_bootstrap = getattr(config, "truncate_bootstrap", True)
+
         # Буферы эпизода
         self.log_probs = []
         self.rewards = []
         self.entropies = []
         self.heights = []
+        self.states = []
+        self.actions = []
         
         # --- Адаптивный Baseline ---
         self.episode_outcomes = []  # Список для хранения исходов
@@ -33,24 +60,36 @@ class ReinforceAgent:
         self.min_window = 15        # Конечное (узкое) окно для скорости реакции
         self.decay_steps = 1000     # За сколько эпизодов окно сузится до минимума
 
-    def select_action(self, state: np.ndarray) -> int:
+    def select_action(self, state: np.ndarray, generator: torch.Generator | None = None) -> int:
+        """generator — поток семплирования (None — глобальный RNG torch)."""
         state_t = torch.from_numpy(state).float().to(self.device).unsqueeze(0)
-        probs = self.policy(state_t)
-        dist = Categorical(probs)
-        action = dist.sample()
-        
-        self.log_probs.append(dist.log_prob(action))
-        self.entropies.append(dist.entropy())
+        # compile / повторное использование пересчитывают log-prob в update_policy
+        # по сохранённым состояниям, граф на каждом шаге им не нужен
+        recompute = self.compile_update or self.reuse_epochs > 0
+        if recompute:
+            with torch.no_grad():
+                probs = self.policy(state_t)
+        else:
+            probs = self.policy(state_t)
+        action = sample_actions(probs, generator)
         
-        # Извлечение block_y
-        if self.state_mode == "relative":
-            block_y = state[1] * self.grid_height
+        if recompute:
+            self.states.append(state_t)
+            self.actions.append(action)
         else:
-            block_y = state[3]
+            dist = Categorical(probs)
+            self.log_probs.append(dist.log_prob(action))
+            self.entropies.append(dist.entropy())
         
-        self.heights.append(block_y)
+        self.heights.append(self.block_height(state))
         return int(action.item())
 
+    def block_height(self, state: np.ndarray) -> float:
+        """Извлечение block_y из состояния (с учётом state_mode)."""
+        if self.state_mode == "relative":
+            return state[1] * self.grid_height
+        return state[3]
+
     def store_reward(self, reward: float) -> None:
         self.rewards.append(reward)
 
@@ -104,23 +143,37 @@ class ReinforceAgent:
         V_h = (self.gamma ** heights) * V0
         return V_h
 
-    def update_policy(self) -> float:
-        if len(self.rewards) < 2:
-            self.clear_buffers()
+    def bootstrap_value(self, state: np.ndarray) -> float:
+        """
+        Оценка ценности состояния, на котором отрезан эпизод. 0, если bootstrap выключен
+        или награды не basic: V(h) зашит под r_miss = 1, r_death = -10.
+        """
+        if not self.truncate_bootstrap or self.reward_mode != "basic":
             return 0.0
+        height = torch.tensor(self.block_height(state), dtype=torch.float32)
+        return float(self.compute_value_baseline(height))
 
+    def chunk_full(self) -> bool:
+        """Набран ли отрезок эпизода для усечённого обновления."""
+        return self.truncate_steps > 0 and len(self.rewards) >= self.truncate_steps
+
+    def compute_advantages(self, rewards: list[float], heights: list[float], bootstrap: float = 0.0) -> torch.Tensor:
+        """
+        G_t (с вычетом baseline, если включён) и нормализация по флагам агента.
+        bootstrap — оценка ценности состояния после последнего шага (для отрезка эпизода).
+        """
         # Расчет дисконтированных вознаграждений (G_t)
         returns = []
-        g = 0.0
-        for r in reversed(self.rewards):
+        g = bootstrap
+        for r in reversed(rewards):
             g = r + self.gamma * g
             returns.insert(0, g)
         
         returns = torch.tensor(returns, dtype=torch.float32, device=self.device)
         
         # Применение Baseline
-        if self.use_height_baseline and len(self.heights) > 0:
-            heights_t = torch.tensor(self.heights, dtype=torch.float32, device=self.device)
+        if self.use_height_baseline and len(heights) > 0:
+            heights_t = torch.tensor(heights, dtype=torch.float32, device=self.device)
             # Синхронизация длин (на случай преждевременного конца эпизода)
             if len(heights_t) != len(returns):
                 heights_t = heights_t[:len(returns)]
@@ -133,6 +186,32 @@ class ReinforceAgent:
         # Нормализация преимуществ
         if self.use_norm and len(advantages) > 1:
             advantages = (advantages - advantages.mean()) / (advantages.std() + 1e-8)
+        return advantages
+
+    def update_policy(self, next_state: np.ndarray | None = None) -> float:
+        """
+        Шаг обучения по буферам и их очистка. next_state передаётся, если эпизод
+        не закончен (усечённое обновление): хвост оценивается через bootstrap_value.
+        """
+        # В режиме усечения последний отрезок может состоять из одного шага
+        # (например, смерть сразу после обновления) — его награду не теряем
+        min_length = 1 if self.truncate_steps > 0 else 2
+        if len(self.rewards) < min_length:
+            self.clear_buffers()
+            return 0.0
+
+        bootstrap = self.bootstrap_value(next_state) if next_state is not None else 0.0
+        advantages = self.compute_advantages(self.rewards, self.heights, bootstrap)
+
+        if self.reuse_epochs > 0:
+            val = self._reuse_update(advantages)
+            self.clear_buffers()
+            return val
+
+        if self.compile_update:
+            val = self._padded_update(advantages)
+            self.clear_buffers()
+            return val
 
         log_probs = torch.stack(self.log_probs).squeeze()
         entropies = torch.stack(self.entropies).squeeze()
@@ -152,8 +231,111 @@ class ReinforceAgent:
         self.clear_buffers()
         return val
 
+    @staticmethod
+    def bucket_length(length: int) -> int:
+        """Длина паддинга: ближайшая степень двойки, не меньше 64 (один граф на бакет)."""
+        bucket = 64
+        while bucket < length:
+            bucket *= 2
+        return bucket
+
+    def _evaluate_actions(self, states, actions):
+        """log π(a|s) и энтропия, как в Categorical (clamp вероятностей по eps)."""
+        probs = self.policy(states)
+        probs = probs / probs.sum(-1, keepdim=True)
+        eps = torch.finfo(probs.dtype).eps
+        logits = torch.log(probs.clamp(eps, 1 - eps))
+        log_probs = logits.gather(-1, actions.unsqueeze(-1)).squeeze(-1)
+        entropies = -(probs * logits).sum(-1)
+        return log_probs, entropies
+
+    def _masked_loss(self, states, actions, advantages, mask, n):
+        """Тот же loss, что в eager update_policy, но по паддингу с маской."""
+        log_probs, entropies = self._evaluate_actions(states, actions)
+
+        policy_loss = -(log_probs * advantages * mask).sum() / n
+        entropy_loss = -self.entropy_coef * (entropies * mask).sum() / n
+        return policy_loss + entropy_loss
+
+    def _clip_and_step(self):
+        torch.nn.utils.clip_grad_norm_(self.policy.parameters(), 1.0)
+        self.optimizer.step()
+
+    def _padded_update(self, advantages: torch.Tensor) -> float:
+        length = len(self.rewards)
+        bucket = self.bucket_length(length)
+        states = torch.zeros(bucket, self.states[0].shape[-1], device=self.device)
+        states[:length] = torch.cat(self.states[:length])
+        actions = torch.zeros(bucket, dtype=torch.long, device=self.device)
+        actions[:length] = torch.cat(self.actions[:length])
+        adv = torch.zeros(bucket, device=self.device)
+        adv[:length] = advantages
+        mask = torch.zeros(bucket, device=self.device)
+        mask[:length] = 1.0
+        n = torch.tensor(float(length), device=self.device)
+
+        try:
+            return self._run_update(self._loss_fn, self._step_fn, states, actions, adv, mask, n)
+        except Exception as e:
+            warnings.warn(f"Compiled update failed ({type(e).__name__}: {e}); falling back to eager mode.")
+            self._loss_fn, self._step_fn = self._masked_loss, self._clip_and_step
+            return self._run_update(self._loss_fn, self._step_fn, states, actions, adv, mask, n)
+
+    def _run_update(self, loss_fn, step_fn, *batch) -> float:
+        self.optimizer.zero_grad()
+        loss = loss_fn(*batch)
+        loss.backward()
+        step_fn()
+        return loss.item()
+
+    def _reuse_update(self, advantages: torch.Tensor) -> float:
+        """
+        Кладёт эпизод (с log-prob поведенческой политики) в буфер и делает до
+        reuse_epochs шагов по всем эпизодам буфера с PPO-подобным clip отношения
+        π/π_behavior. Эпохи прекращаются, если приближённый KL от политики на начало
+        этого обновления превысил max_kl (а не от π_behavior: старые эпизоды буфера
+        уже на несколько обновлений позади и сработали бы на первой же эпохе).
+        Каждый эпизод входит в loss с одинаковым весом (mean по эпизоду, как в REINFORCE).
+        """
+        states = torch.cat(self.states)
+        actions = torch.cat(self.actions)
+        with torch.no_grad():
+            behavior_log_probs, _ = self._evaluate_actions(states, actions)
+        self.replay.append((states, actions, advantages.detach(), behavior_log_probs))
+
+        states = torch.cat([ep[0] for ep in self.replay])
+        actions = torch.cat([ep[1] for ep in self.replay])
+        advantages = torch.cat([ep[2] for ep in self.replay])
+        old_log_probs = torch.cat([ep[3] for ep in self.replay])
+        weights = torch.cat([torch.full((len(ep[1]),), 1.0 / len(ep[1])) for ep in self.replay])
+        weights = weights.to(self.device) / len(self.replay)
+        with torch.no_grad():
+            start_log_probs, _ = self._evaluate_actions(states, actions)
+
+        val = 0.0
+        for epoch in range(self.reuse_epochs):
+            log_probs, entropies = self._evaluate_actions(states, actions)
+            with torch.no_grad():
+                drift = log_probs - start_log_probs
+                approx_kl = ((drift.exp() - 1) - drift).mul(weights).sum().item()
+            if epoch > 0 and approx_kl > self.max_kl:
+                break
+
+            ratio = (log_probs - old_log_probs).exp()
+            clipped = ratio.clamp(1 - self.clip_ratio, 1 + self.clip_ratio)
+            surrogate = torch.min(ratio * advantages, clipped * advantages)
+            loss = -(surrogate * weights).sum() - self.entropy_coef * (entropies * weights).sum()
+
+            self.optimizer.zero_grad()
+            loss.backward()
+            torch.nn.utils.clip_grad_norm_(self.policy.parameters(), 1.0)
+            self.optimizer.step()
+            val = loss.item()
+        return val
+
     def clear_buffers(self):
         self.log_probs, self.rewards, self.entropies, self.heights = [], [], [], []
+        self.states, self.actions = [], []
 
     def save(self, path): torch.save(self.policy.state_dict(), path)
     def load(self, path): self.policy.load_state_dict(torch.load(path, map_location=self.device))
\ No newline at end of file
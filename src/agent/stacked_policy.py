@@ -0,0 +1,59 @@
+import torch
+import torch.nn as nn
+from src.agent.policy_network import PolicyNetwork
+
+# Линейные слои внутри PolicyNetwork.net (индексы nn.Sequential)
+LINEAR_LAYERS = (0, 2, 4)
+
+
+class StackedPolicyNetwork(nn.Module):
+    """
+    N независимых PolicyNetwork одной архитектуры, сложенных в общие тензоры.
+    Веса слоя хранятся как (N, out, in), поэтому forward для всех моделей —
+    это три batched matmul (baddbmm) вместо N отдельных проходов.
+    """
+
+    def __init__(self, weights: list[torch.Tensor], biases: list[torch.Tensor]) -> None:
+        super().__init__()
+        self.weights = nn.ParameterList(nn.Parameter(w) for w in weights)
+        self.biases = nn.ParameterList(nn.Parameter(b) for b in biases)
+
+    @classmethod
+    def from_state_dicts(cls, state_dicts: list[dict]) -> "StackedPolicyNetwork":
+        """Собирает стек из state_dict'ов PolicyNetwork (формат чекпоинтов ReinforceAgent.save)."""
+        weights, biases = [], []
+        for i in LINEAR_LAYERS:
+            weights.append(torch.stack([sd[f"net.{i}.weight"].float() for sd in state_dicts]))
+            biases.append(torch.stack([sd[f"net.{i}.bias"].float() for sd in state_dicts]))
+        return cls(weights, biases)
+
+    @classmethod
+    def from_policies(cls, policies: list[PolicyNetwork]) -> "StackedPolicyNetwork":
+        return cls.from_state_dicts([p.state_dict() for p in policies])
+
+    @property
+    def num_models(self) -> int:
+        return self.weights[0].shape[0]
+
+    def forward(self, x: torch.Tensor, members=None) -> torch.Tensor:
+        """
+        Принимает состояния shape (N, B, state_dim).
+        Возвращает вероятности действий shape (N, B, action_dim).
+        members — индексы подмножества моделей: тогда x и результат имеют shape (len(members), B, ...).
+        """
+        last = len(self.weights) - 1
+        for i, (w, b) in enumerate(zip(self.weights, self.biases)):
+            if members is not None:
+                w, b = w[members], b[members]
+            x = torch.baddbmm(b.unsqueeze(1), x, w.transpose(1, 2))
+            if i < last:
+                x = torch.relu(x)
+        return torch.softmax(x, dim=-1)
+
+    def state_dict_of(self, index: int) -> dict:
+        """Извлекает веса модели index в формате state_dict PolicyNetwork."""
+        sd = {}
+        for layer, w, b in zip(LINEAR_LAYERS, self.weights, self.biases):
+            sd[f"net.{layer}.weight"] = w[index].detach().clone()
+            sd[f"net.{layer}.bias"] = b[index].detach().clone()
+        return sd
@@ -0,0 +1,48 @@
+# Единая точка входа: dodge-blocks <command> [args] (или python -m src <command>).
+# Модули команд импортируются только при запуске соответствующей команды,
+# поэтому torch / pandas / pygame загружаются лишь там, где они нужны.
+import importlib
+import sys
+
+# command -> (модуль в run/, описание)
+COMMANDS = {
+    "train": ("run.train", "Train a single agent"),
+    "train-ensemble": ("run.train_ensemble", "Train many seeds in one process"),
+    "evaluate": ("run.evaluate", "Evaluate a checkpoint"),
+    "tournament": ("run.tournament", "Rank many checkpoints on matched episodes"),
+    "play": ("run.play", "Play the game (human or agent)"),
+    "record": ("run.record", "Record gameplay GIFs"),
+    "serve": ("run.serve", "Serve a policy checkpoint to many local clients"),
+    "bench-startup": ("run.bench_startup", "Measure CLI startup time"),
+    "bench-update": ("run.bench_update", "Per-update latency: eager vs compiled update_policy"),
+    "bench-convergence": ("run.bench_convergence", "Convergence speed across reference configs and seeds"),
+    "bench-scaling": ("run.bench_scaling", "Throughput, latency and memory vs grid size and episode length"),
+}
+
+
+def usage() -> str:
+    lines = ["usage: dodge-blocks <command> [args]", "", "commands:"]
+    for name, (_, help_text) in COMMANDS.items():
+        lines.append(f"  {name:<16}{help_text}")
+    return "\n".join(lines)
+
+
+def main(argv: list[str] | None = None) -> int:
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv or argv[0] in ("-h", "--help"):
+        print(usage())
+        return 0
+
+    command, rest = argv[0], argv[1:]
+    if command not in COMMANDS:
+        print(f"Unknown command: {command}\n\n{usage()}", file=sys.stderr)
+        return 2
+
+    module = importlib.import_module(COMMANDS[command][0])
+    sys.argv = [f"dodge-blocks {command}"] + rest
+    module.main(rest)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,9 +1,10 @@
 import numpy as np
 
 class GameEnv:
-    def __init__(self, config, seed) -> None:
+    def __init__(self, config, seed=None) -> None:
+        """seed — int или np.random.SeedSequence; по умолчанию берётся config.seed."""
         self.cfg = config
-        self.rng = np.random.default_rng(seed)
+        self.rng = np.random.default_rng(config.seed if seed is None else seed)
         self.reset()
 
     def reset(self) -> np.ndarray:
@@ -1,7 +1,45 @@
+import time
 import pygame
 import numpy as np
 from src.utils.config import EnvConfig, RenderConfig
 
+
+def draw_env(surface, env, env_cfg: EnvConfig, render_cfg: RenderConfig, c_size: int, offset=(0, 0)) -> None:
+    """
+    Рисует поле одной среды на surface в прямоугольнике с левым верхним углом offset.
+    Берем данные напрямую из env, а не из нормализованного state.
+    """
+    ox, oy = offset
+    width = env_cfg.grid_width * c_size
+    height = env_cfg.grid_height * c_size
+    surface.fill(render_cfg.colors["bg"], pygame.Rect(ox, oy, width, height))
+
+    # Сетка
+    for x in range(0, width, c_size):
+        pygame.draw.line(surface, render_cfg.colors["grid"], (ox + x, oy), (ox + x, oy + height))
+    for y in range(0, height, c_size):
+        pygame.draw.line(surface, render_cfg.colors["grid"], (ox, oy + y), (ox + width, oy + y))
+
+    # Координаты из среды
+    agent_x = env.agent_x
+    b_left = env.block_left
+    b_right = env.block_right
+    b_y = env.block_y
+
+    # Инверсия Y (в Pygame 0 - это верх)
+    display_y = (env_cfg.grid_height - 1 - b_y) * c_size
+    agent_display_y = (env_cfg.grid_height - 1) * c_size
+
+    # Рисуем Агента
+    agent_rect = pygame.Rect(ox + int(agent_x * c_size), oy + int(agent_display_y), c_size, c_size)
+    pygame.draw.rect(surface, render_cfg.colors["agent"], agent_rect)
+
+    # Рисуем Блок
+    block_width_cells = (b_right - b_left) + 1
+    block_rect = pygame.Rect(ox + int(b_left * c_size), oy + int(display_y), int(block_width_cells * c_size), c_size)
+    pygame.draw.rect(surface, render_cfg.colors["block"], block_rect)
+
+
 class GameRenderer:
     def __init__(self, env_config: EnvConfig, render_config: RenderConfig) -> None:
         self.env_cfg = env_config
@@ -26,39 +64,10 @@ class GameRenderer:
         self.clock = pygame.time.Clock()
 
     def render(self, env, score: int) -> None:
-        """
-        Берем данные напрямую из env, а не из нормализованного state.
-        """
         if self.screen is None:
             self.init_display()
 
-        self.screen.fill(self.render_cfg.colors["bg"])
-        c_size = self.render_cfg.cell_size
-
-        # Сетка
-        for x in range(0, self.win_width, c_size):
-            pygame.draw.line(self.screen, self.render_cfg.colors["grid"], (x, 0), (x, self.win_height))
-        for y in range(0, self.win_height, c_size):
-            pygame.draw.line(self.screen, self.render_cfg.colors["grid"], (0, y), (self.win_width, y))
-
-        # Координаты из среды
-        agent_x = env.agent_x
-        b_left = env.block_left
-        b_right = env.block_right
-        b_y = env.block_y
-        
-        # Инверсия Y (в Pygame 0 - это верх)
-        display_y = (self.env_cfg.grid_height - 1 - b_y) * c_size
-        agent_display_y = (self.env_cfg.grid_height - 1) * c_size
-
-        # Рисуем Агента
-        agent_rect = pygame.Rect(int(agent_x * c_size), int(agent_display_y), c_size, c_size)
-        pygame.draw.rect(self.screen, self.render_cfg.colors["agent"], agent_rect)
-
-        # Рисуем Блок
-        block_width_cells = (b_right - b_left) + 1
-        block_rect = pygame.Rect(int(b_left * c_size), int(display_y), int(block_width_cells * c_size), c_size)
-        pygame.draw.rect(self.screen, self.render_cfg.colors["block"], block_rect)
+        draw_env(self.screen, env, self.env_cfg, self.render_cfg, self.render_cfg.cell_size)
 
         # Счет
         if self.font:
@@ -89,4 +98,105 @@ class GameRenderer:
         if self.screen is None: self.init_display()
         for event in pygame.event.get():
             if event.type == pygame.QUIT: return False
-        return True
\ No newline at end of file
+        return True
+
+
+class TiledRenderer:
+    """
+    Мониторинг N сред в одном окне (или в одном numpy-кадре при headless=True).
+    Поля рисуются плиткой cols x rows за один проход, у каждой плитки — подпись
+    (счёт / статистика эпизода). Кадр рисуется не чаще max_fps раз в секунду:
+    лишние вызовы render() стоят одного perf_counter и не тормозят rollout.
+    """
+
+    def __init__(
+        self,
+        env_config: EnvConfig,
+        render_config: RenderConfig,
+        num_envs: int,
+        cols: int | None = None,
+        cell_size: int = 16,
+        headless: bool = False,
+        max_fps: float = 5.0,
+    ) -> None:
+        self.env_cfg = env_config
+        self.render_cfg = render_config
+        self.num_envs = num_envs
+        self.cols = cols or int(np.ceil(np.sqrt(num_envs)))
+        self.rows = int(np.ceil(num_envs / self.cols))
+        self.cell_size = cell_size
+        self.headless = headless
+        self.min_interval = 1.0 / max_fps if max_fps > 0 else 0.0
+
+        self.tile_width = env_config.grid_width * cell_size
+        self.tile_height = env_config.grid_height * cell_size
+        self.gap = 2
+        self.win_width = self.cols * (self.tile_width + self.gap) - self.gap
+        self.win_height = self.rows * (self.tile_height + self.gap) - self.gap
+
+        self.surface = None
+        self.font = None
+        self.last_draw = -float("inf")
+        self.frames_drawn = 0
+
+    def init_display(self) -> None:
+        try:
+            pygame.font.init()
+            self.font = pygame.font.Font(None, max(12, self.cell_size + 2))
+        except:
+            self.font = None
+
+        if self.headless:
+            self.surface = pygame.Surface((self.win_width, self.win_height))
+        else:
+            pygame.init()
+            self.surface = pygame.display.set_mode((self.win_width, self.win_height))
+            pygame.display.set_caption(f"Dodge Blocks - {self.num_envs} envs")
+
+    def due(self) -> bool:
+        """Пора ли рисовать следующий кадр (прошло не меньше 1/max_fps секунд)."""
+        return time.perf_counter() - self.last_draw >= self.min_interval
+
+    def render(self, envs, labels=None, force: bool = False):
+        """
+        Рисует все среды, если due() (или force=True). labels — строка на среду
+        или callable, возвращающий их (вызывается только при отрисовке);
+        перевод строки разбивает подпись на строки.
+        В headless-режиме возвращает кадр (H, W, 3) uint8, иначе None.
+        """
+        if not force and not self.due():
+            return None
+        self.last_draw = time.perf_counter()
+        if callable(labels):
+            labels = labels()
+        if self.surface is None:
+            self.init_display()
+
+        self.surface.fill(self.render_cfg.colors["grid"])
+        for i, env in enumerate(envs):
+            row, col = divmod(i, self.cols)
+            offset = (col * (self.tile_width + self.gap), row * (self.tile_height + self.gap))
+            draw_env(self.surface, env, self.env_cfg, self.render_cfg, self.cell_size, offset)
+
+            if self.font and labels is not None:
+                for j, line in enumerate(str(labels[i]).split("\n")):
+                    text_surface = self.font.render(line, True, self.render_cfg.colors["text"])
+                    self.surface.blit(text_surface, (offset[0] + 2, offset[1] + 2 + j * self.font.get_linesize()))
+
+        self.frames_drawn += 1
+        if self.headless:
+            return np.transpose(pygame.surfarray.array3d(self.surface), (1, 0, 2))
+        pygame.display.flip()
+        pygame.event.pump()
+        return None
+
+    def handle_events(self) -> bool:
+        if self.headless or self.surface is None:
+            return True
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT: return False
+        return True
+
+    def close(self) -> None:
+        if not self.headless:
+            pygame.quit()
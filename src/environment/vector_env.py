@@ -0,0 +1,233 @@
+import multiprocessing as mp
+import numpy as np
+from src.environment.game_env import GameEnv
+
+# Команды воркерам
+_STEP, _RESET, _CLOSE = 0, 1, 2
+
+
+class SyncVectorEnv:
+    """
+    N экземпляров GameEnv в текущем процессе с батчевым интерфейсом:
+      reset(mask) -> obs (N, D)
+      step(actions, mask) -> obs (N, D), rewards (N,), dones (N,), infos (list of dict)
+    mask (bool, N) выбирает, какие среды сбросить/шагнуть; остальные не трогаются
+    (возвращают последнее наблюдение, reward 0, done False).
+    При autoreset завершившаяся среда сразу сбрасывается, а её последнее
+    наблюдение кладётся в info["final_observation"].
+    """
+
+    def __init__(self, config, seeds: list, autoreset: bool = True) -> None:
+        self.cfg = config
+        self.num_envs = len(seeds)
+        self.autoreset = autoreset
+        self.envs = [GameEnv(config, seed) for seed in seeds]
+        self.obs = np.stack([env.get_state() for env in self.envs])
+        self._pending = None
+
+    def reset(self, mask=None) -> np.ndarray:
+        for i in _indices(mask, self.num_envs):
+            self.obs[i] = self.envs[i].reset()
+        return self.obs.copy()
+
+    def step_async(self, actions, mask=None) -> None:
+        self._pending = (np.asarray(actions), mask)
+
+    def step_wait(self):
+        actions, mask = self._pending
+        self._pending = None
+        rewards = np.zeros(self.num_envs, dtype=np.float64)
+        dones = np.zeros(self.num_envs, dtype=bool)
+        infos = [{} for _ in range(self.num_envs)]
+
+        for i in _indices(mask, self.num_envs):
+            obs, reward, done, info = self.envs[i].step(int(actions[i]))
+            rewards[i], dones[i], infos[i] = reward, done, info
+            if done and self.autoreset:
+                info["final_observation"] = obs
+                obs = self.envs[i].reset()
+            self.obs[i] = obs
+        return self.obs.copy(), rewards, dones, infos
+
+    def step(self, actions, mask=None):
+        self.step_async(actions, mask)
+        return self.step_wait()
+
+    def close(self) -> None:
+        pass
+
+
+class SubprocVectorEnv:
+    """
+    Тот же интерфейс, что у SyncVectorEnv, но среды живут в num_workers процессах.
+    Действия и результаты передаются через общую память (кольцевой буфер из
+    ring_size слотов), по каналам идут только семафоры. step_async возвращает
+    управление сразу, и пока воркеры шагают, можно считать политику.
+    Возвращаемые obs — view на слот кольца: они валидны ещё ring_size - 1 шагов.
+    Каждая среда получает свой seed, поэтому траектории не зависят от num_workers.
+    """
+
+    def __init__(
+        self,
+        config,
+        seeds: list,
+        num_workers: int | None = None,
+        autoreset: bool = True,
+        ring_size: int = 2,
+        start_method: str | None = None,
+    ) -> None:
+        self.cfg = config
+        self.num_envs = len(seeds)
+        self.autoreset = autoreset
+        self.ring_size = ring_size
+        num_workers = min(num_workers or mp.cpu_count(), self.num_envs)
+        ctx = mp.get_context(start_method)
+
+        obs_dim = len(GameEnv(config, 0).get_state())
+        n = self.num_envs
+        self._shared = {
+            "actions": ctx.RawArray("q", ring_size * n),
+            "mask": ctx.RawArray("B", ring_size * n),
+            "obs": ctx.RawArray("f", ring_size * n * obs_dim),
+            "final_obs": ctx.RawArray("f", ring_size * n * obs_dim),
+            "rewards": ctx.RawArray("d", ring_size * n),
+            "dones": ctx.RawArray("B", ring_size * n),
+            "miss": ctx.RawArray("B", ring_size * n),
+            "death": ctx.RawArray("B", ring_size * n),
+            "command": ctx.RawArray("q", 2 * num_workers),  # (команда, слот) на воркера
+        }
+        self._views = _ring_views(self._shared, ring_size, n, obs_dim)
+
+        self._chunks = np.array_split(np.arange(n), num_workers)
+        self._command_sems = [ctx.Semaphore(0) for _ in range(num_workers)]
+        self._done_sems = [ctx.Semaphore(0) for _ in range(num_workers)]
+        self._procs = []
+        for w, chunk in enumerate(self._chunks):
+            proc = ctx.Process(
+                target=_worker,
+                args=(w, config, [seeds[i] for i in chunk], int(chunk[0]), autoreset, ring_size, n, obs_dim,
+                      self._shared, self._command_sems[w], self._done_sems[w]),
+                daemon=True,
+            )
+            proc.start()
+            self._procs.append(proc)
+
+        self._slot = 0
+        self._pending_slot = None
+        self._closed = False
+
+    def _send(self, command: int, slot: int) -> None:
+        commands = np.frombuffer(self._shared["command"], dtype=np.int64).reshape(-1, 2)
+        for w, sem in enumerate(self._command_sems):
+            commands[w] = (command, slot)
+            sem.release()
+
+    def _wait(self) -> None:
+        for proc, sem in zip(self._procs, self._done_sems):
+            while not sem.acquire(timeout=1.0):
+                if not proc.is_alive():
+                    raise RuntimeError(f"Vector env worker {proc.pid} died (exit code {proc.exitcode})")
+
+    def _next_slot(self, mask) -> int:
+        slot = self._slot
+        self._slot = (self._slot + 1) % self.ring_size
+        self._views["mask"][slot] = True if mask is None else np.asarray(mask, dtype=bool)
+        return slot
+
+    def reset(self, mask=None) -> np.ndarray:
+        slot = self._next_slot(mask)
+        self._send(_RESET, slot)
+        self._wait()
+        return self._views["obs"][slot]
+
+    def step_async(self, actions, mask=None) -> None:
+        slot = self._next_slot(mask)
+        self._views["actions"][slot] = actions
+        self._send(_STEP, slot)
+        self._pending_slot = slot
+
+    def step_wait(self):
+        slot, self._pending_slot = self._pending_slot, None
+        self._wait()
+        v = self._views
+        infos = []
+        for i in range(self.num_envs):
+            info = {}
+            if v["miss"][slot, i]:
+                info["miss"] = True
+            if v["death"][slot, i]:
+                info["death"] = True
+            if self.autoreset and v["dones"][slot, i]:
+                info["final_observation"] = v["final_obs"][slot, i].copy()
+            infos.append(info)
+        return v["obs"][slot], v["rewards"][slot].copy(), v["dones"][slot].astype(bool), infos
+
+    def step(self, actions, mask=None):
+        self.step_async(actions, mask)
+        return self.step_wait()
+
+    def close(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        self._send(_CLOSE, 0)
+        for proc in self._procs:
+            proc.join(timeout=5.0)
+            if proc.is_alive():
+                proc.terminate()
+
+    def __del__(self) -> None:
+        try:
+            self.close()
+        except Exception:
+            pass
+
+
+def _indices(mask, n: int):
+    if mask is None:
+        return range(n)
+    return np.flatnonzero(mask)
+
+
+def _ring_views(shared: dict, ring_size: int, n: int, obs_dim: int) -> dict:
+    dtypes = {"actions": np.int64, "mask": np.bool_, "obs": np.float32, "final_obs": np.float32,
+              "rewards": np.float64, "dones": np.uint8, "miss": np.uint8, "death": np.uint8}
+    views = {}
+    for name, dtype in dtypes.items():
+        shape = (ring_size, n, obs_dim) if name in ("obs", "final_obs") else (ring_size, n)
+        views[name] = np.frombuffer(shared[name], dtype=dtype).reshape(shape)
+    return views
+
+
+def _worker(worker_id, config, seeds, offset, autoreset, ring_size, n, obs_dim, shared, command_sem, done_sem):
+    """Цикл воркера: ждёт команду, обрабатывает свой срез сред, пишет результат в слот кольца."""
+    envs = [GameEnv(config, seed) for seed in seeds]
+    last_obs = [env.get_state() for env in envs]
+    views = _ring_views(shared, ring_size, n, obs_dim)
+    commands = np.frombuffer(shared["command"], dtype=np.int64).reshape(-1, 2)
+
+    while True:
+        command_sem.acquire()
+        command, slot = commands[worker_id]
+        if command == _CLOSE:
+            return
+
+        for j, env in enumerate(envs):
+            i = offset + j
+            views["rewards"][slot, i] = 0.0
+            views["dones"][slot, i] = views["miss"][slot, i] = views["death"][slot, i] = 0
+            if views["mask"][slot, i]:
+                if command == _RESET:
+                    last_obs[j] = env.reset()
+                else:
+                    obs, reward, done, info = env.step(int(views["actions"][slot, i]))
+                    views["rewards"][slot, i] = reward
+                    views["dones"][slot, i] = done
+                    views["miss"][slot, i] = info.get("miss", False)
+                    views["death"][slot, i] = info.get("death", False)
+                    if done and autoreset:
+                        views["final_obs"][slot, i] = obs
+                        obs = env.reset()
+                    last_obs[j] = obs
+            views["obs"][slot, i] = last_obs[j]
+        done_sem.release()
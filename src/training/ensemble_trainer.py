@@ -0,0 +1,296 @@
+import os
+import numpy as np
+import torch
+from collections import deque
+from torch.distributions import Categorical
+from src.agent.stacked_policy import StackedPolicyNetwork
+from src.utils.seed import sample_actions
+
+
+class BatchedAdam:
+    """
+    Adam для сложенных параметров shape (K, ...): у каждого участника свои моменты
+    и свой счётчик шагов, обновляются только участники из маски.
+    Формулы совпадают с torch.optim.Adam (без weight decay и amsgrad).
+    """
+
+    def __init__(self, params, lr: float, betas=(0.9, 0.999), eps: float = 1e-8) -> None:
+        self.params = list(params)
+        self.lr = lr
+        self.beta1, self.beta2 = betas
+        self.eps = eps
+        k = self.params[0].shape[0]
+        self.steps = torch.zeros(k, dtype=torch.float64)
+        self.exp_avg = [torch.zeros_like(p) for p in self.params]
+        self.exp_avg_sq = [torch.zeros_like(p) for p in self.params]
+
+    def zero_grad(self) -> None:
+        for p in self.params:
+            p.grad = None
+
+    @torch.no_grad()
+    def step(self, idx: torch.Tensor) -> None:
+        """idx — индексы участников, которые делают шаг."""
+        self.steps[idx] += 1
+        steps = self.steps[idx]
+        bias_correction1 = (1 - self.beta1 ** steps).float()
+        bias_correction2_sqrt = (1 - self.beta2 ** steps).sqrt().float()
+        step_size = self.lr / bias_correction1
+
+        for p, m, v in zip(self.params, self.exp_avg, self.exp_avg_sq):
+            shape = (-1,) + (1,) * (p.dim() - 1)
+            g = p.grad[idx]
+            m_i = m[idx].lerp_(g, 1 - self.beta1)
+            v_i = v[idx].mul_(self.beta2).addcmul_(g, g, value=1 - self.beta2)
+            m[idx], v[idx] = m_i, v_i
+            denom = (v_i.sqrt() / bias_correction2_sqrt.view(shape)).add_(self.eps)
+            p[idx] = p[idx] - step_size.view(shape) * m_i / denom
+
+
+@torch.no_grad()
+def clip_grad_norm_per_model(params, max_norm: float) -> torch.Tensor:
+    """clip_grad_norm_ отдельно для каждого участника стека (норма по всем его параметрам)."""
+    params = [p for p in params if p.grad is not None]
+    norms = torch.stack([p.grad.flatten(1).pow(2).sum(1) for p in params]).sum(0).sqrt()
+    coef = (max_norm / (norms + 1e-6)).clamp(max=1.0)
+    for p in params:
+        p.grad.mul_(coef.view((-1,) + (1,) * (p.grad.dim() - 1)))
+    return norms
+
+
+class EnsembleTrainer:
+    """
+    Обучает K независимых агентов в одном процессе.
+    Параметры всех ReinforceAgent сложены в StackedPolicyNetwork, так что forward и
+    backward для всех K — batched matmul. У каждого участника своя среда (свой RNG),
+    свой генератор семплирования, свои моменты Adam, логгер и early stop, а старт
+    (веса, потоки среды и семплирования) — как у run/train.py с тем же seed.
+    Траектории при этом не совпадают с отдельным запуском бит в бит: baddbmm и
+    BatchedAdam округляют иначе, чем nn.Linear и torch.optim.Adam, и за сотни
+    эпизодов дрейф весов меняет какое-то семплированное действие. Ансамбль
+    статистически эквивалентен отдельным запускам, но не воспроизводит их по seed'ам.
+    Среды передаются как vector env (SyncVectorEnv или SubprocVectorEnv, autoreset=False),
+    участник k играет в среде k.
+    """
+
+    def __init__(self, vec_env, agents, train_configs, loggers, generators, monitor=None) -> None:
+        self.vec_env = vec_env
+        # TiledRenderer по средам vec_env (только SyncVectorEnv: среды в этом процессе)
+        self.monitor = monitor
+        self.agents = agents
+        self.cfgs = train_configs
+        self.loggers = loggers
+        self.generators = generators
+        self.num_members = len(agents)
+
+        # Общие параметры обучения берём у первого участника
+        self.cfg = train_configs[0]
+        self.entropy_coef = agents[0].entropy_coef
+
+        for agent in agents:
+            agent.grid_height = vec_env.cfg.grid_height
+            agent.state_mode = vec_env.cfg.state_mode
+
+        self.policy = StackedPolicyNetwork.from_policies([a.policy for a in agents])
+        self.optimizer = BatchedAdam(self.policy.parameters(), lr=agents[0].lr)
+
+        self.best_rewards = [-float('inf')] * self.num_members
+        self.early_stop_window = getattr(self.cfg, 'early_stop_window', 30)
+        self.early_stop_threshold = getattr(self.cfg, 'early_stop_threshold', 0.8)
+        self.recent_steps = [deque(maxlen=self.early_stop_window) for _ in agents]
+
+        for cfg in train_configs:
+            os.makedirs(cfg.checkpoint_dir, exist_ok=True)
+
+    def train(self) -> list[dict]:
+        print(f"Starting ensemble training: {self.num_members} agents, {self.cfg.num_episodes} episodes...")
+
+        running_rewards = [0.0] * self.num_members
+        active = list(range(self.num_members))
+        results = [{"episodes": 0, "early_stopped": False} for _ in range(self.num_members)]
+
+        for episode in range(1, self.cfg.num_episodes + 1):
+            rollouts = self.run_episodes(active)
+            losses = self.update_policies(rollouts)
+
+            finished = []
+            for k in active:
+                reward, steps = rollouts[k]["total_reward"], len(rollouts[k]["rewards"])
+                results[k]["episodes"] = episode
+
+                if episode == 1:
+                    running_rewards[k] = reward
+                else:
+                    running_rewards[k] = 0.1 * reward + 0.9 * running_rewards[k]
+
+                if episode % self.cfg.log_every == 0:
+                    self.loggers[k].log_episode(episode, running_rewards[k], steps, losses[k])
+
+                if running_rewards[k] > self.best_rewards[k] and episode > 100:
+                    self.best_rewards[k] = running_rewards[k]
+                    self.save_model(k, "best.pt")
+
+                if episode % self.cfg.checkpoint_every == 0:
+                    self.save_model(k, "last.pt")
+
+                self.recent_steps[k].append(steps)
+                if len(self.recent_steps[k]) == self.early_stop_window:
+                    ratio = sum(
+                        1 for s in self.recent_steps[k]
+                        if s >= self.cfg.max_steps_per_episode
+                    ) / self.early_stop_window
+                    if ratio >= self.early_stop_threshold:
+                        print(f"Agent {k}: early stop at episode {episode}.")
+                        self.save_model(k, "last.pt")
+                        results[k]["early_stopped"] = True
+                        finished.append(k)
+
+            active = [k for k in active if k not in finished]
+            if episode % 100 == 0:
+                mean_running = np.mean([running_rewards[k] for k in range(self.num_members)])
+                print(f"Ep: {episode:4d} | Active: {len(active)}/{self.num_members} | Mean Reward: {mean_running:6.1f}")
+            if not active:
+                break
+
+        for k in active:
+            self.save_model(k, "last.pt")
+        print("Ensemble training finished.")
+        return results
+
+    def run_episodes(self, members: list[int]) -> dict:
+        """
+        Играет по одному эпизоду для каждого участника из members.
+        Участники делятся на две группы, которые шагают по очереди: пока vector env
+        выполняет step_async одной группы, считается forward и семплирование другой.
+        Действие участника зависит только от его состояния и его генератора, поэтому
+        траектории те же, что при шаге всех сразу.
+        """
+        mask = np.zeros(self.num_members, dtype=bool)
+        mask[members] = True
+        states = np.array(self.vec_env.reset(mask), dtype=np.float32)
+        actions = np.zeros(self.num_members, dtype=np.int64)
+        rollouts = {
+            k: {"states": [], "actions": [], "rewards": [], "heights": [], "total_reward": 0.0}
+            for k in members
+        }
+
+        groups = [list(members[0::2]), list(members[1::2])]
+        self.select_actions(groups[0], states, actions, rollouts)
+        pending = 0 if groups[0] else None
+        if pending is not None:
+            self.step_async(groups[0], actions, mask)
+
+        while pending is not None:
+            other = 1 - pending
+            if groups[other]:
+                # Перекрывается с шагом сред группы pending
+                self.select_actions(groups[other], states, actions, rollouts)
+
+            next_states, rewards, dones, infos = self.vec_env.step_wait()
+            group = groups[pending]
+            states[group] = next_states[group]
+
+            still_playing = []
+            for k in group:
+                ro = rollouts[k]
+                ro["rewards"].append(float(rewards[k]))
+                ro["total_reward"] += float(rewards[k])
+                self.agents[k].update_episode_stats(infos[k])
+
+                if not dones[k] and len(ro["rewards"]) < self.cfg.max_steps_per_episode:
+                    still_playing.append(k)
+            groups[pending] = still_playing
+
+            if self.monitor is not None and self.monitor.due():
+                self.update_monitor(rollouts)
+
+            if groups[other]:
+                pending = other
+            elif groups[pending]:
+                # Вторая группа закончила: дальше без перекрытия
+                self.select_actions(groups[pending], states, actions, rollouts)
+            else:
+                pending = None
+            if pending is not None:
+                self.step_async(groups[pending], actions, mask)
+
+        return rollouts
+
+    def update_monitor(self, rollouts: dict) -> None:
+        """Кадр мониторинга; закрытие окна выключает мониторинг, обучение продолжается."""
+        if not self.monitor.handle_events():
+            self.monitor.close()
+            self.monitor = None
+            return
+        labels = [
+            f"{k}: {rollouts[k]['total_reward']:.0f}\nT {len(rollouts[k]['rewards'])}" if k in rollouts else f"{k}: -"
+            for k in range(self.num_members)
+        ]
+        self.monitor.render(self.vec_env.envs, labels, force=True)
+
+    def select_actions(self, group: list[int], states, actions, rollouts: dict) -> None:
+        """Forward только по моделям группы и семплирование их действий."""
+        with torch.no_grad():
+            probs = self.policy(torch.from_numpy(states[group]).unsqueeze(1), members=group).squeeze(1)
+
+        for j, k in enumerate(group):
+            # Тот же семплер, что в ReinforceAgent.select_action
+            actions[k] = int(sample_actions(probs[j:j + 1], self.generators[k]).item())
+
+            ro = rollouts[k]
+            ro["states"].append(states[k].copy())
+            ro["actions"].append(int(actions[k]))
+            ro["heights"].append(self.agents[k].block_height(states[k]))
+
+    def step_async(self, group: list[int], actions, mask) -> None:
+        mask[:] = False
+        mask[group] = True
+        self.vec_env.step_async(actions, mask)
+
+    def update_policies(self, rollouts: dict) -> dict:
+        """Один batched шаг REINFORCE для всех участников с эпизодом длиной >= 2."""
+        losses = {k: 0.0 for k in rollouts}
+        members = [k for k, ro in rollouts.items() if len(ro["rewards"]) >= 2]
+        if not members:
+            return losses
+
+        max_len = max(len(rollouts[k]["rewards"]) for k in members)
+        state_dim = self.policy.weights[0].shape[-1]
+        states = torch.zeros(self.num_members, max_len, state_dim)
+        actions = torch.zeros(self.num_members, max_len, dtype=torch.long)
+        advantages = torch.zeros(self.num_members, max_len)
+        mask = torch.zeros(self.num_members, max_len)
+        lengths = torch.ones(self.num_members)
+
+        for k in members:
+            ro = rollouts[k]
+            t = len(ro["rewards"])
+            states[k, :t] = torch.from_numpy(np.stack(ro["states"]))
+            actions[k, :t] = torch.tensor(ro["actions"])
+            advantages[k, :t] = self.agents[k].compute_advantages(ro["rewards"], ro["heights"])
+            mask[k, :t] = 1.0
+            lengths[k] = t
+
+        dist = Categorical(self.policy(states))
+        log_probs = dist.log_prob(actions)
+        entropies = dist.entropy()
+
+        # Loss каждого участника — как в ReinforceAgent.update_policy (mean по его эпизоду)
+        policy_loss = -(log_probs * advantages * mask).sum(1) / lengths
+        entropy_loss = -self.entropy_coef * (entropies * mask).sum(1) / lengths
+        member_losses = policy_loss + entropy_loss
+
+        idx = torch.tensor(members)
+        self.optimizer.zero_grad()
+        member_losses[idx].sum().backward()
+        clip_grad_norm_per_model(self.policy.parameters(), 1.0)
+        self.optimizer.step(idx)
+
+        for k in members:
+            losses[k] = member_losses[k].item()
+        return losses
+
+    def save_model(self, k: int, name: str) -> None:
+        agent = self.agents[k]
+        agent.policy.load_state_dict(self.policy.state_dict_of(k))
+        agent.save(os.path.join(self.cfgs[k].checkpoint_dir, name))
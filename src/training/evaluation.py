@@ -0,0 +1,258 @@
+import math
+import multiprocessing as mp
+import queue
+import torch
+from src.utils.seed import derive_seed, torch_generator
+from src.utils.stats import RunningStats, t_value
+
+
+def play_episode(env, agent, max_steps: int, generator=None) -> tuple[float, int]:
+    """
+    Играет один эпизод без обучения. Возвращает (reward, steps).
+    generator — поток семплирования действий (None — глобальный RNG torch).
+    """
+    state = env.reset()
+    done = False
+    episode_reward = 0.0
+    episode_steps = 0
+
+    while not done:
+        with torch.no_grad():
+            action = agent.select_action(state, generator)
+            agent.clear_buffers()
+
+        state, reward, done, _ = env.step(action)
+        episode_reward += reward
+        episode_steps += 1
+
+        if episode_steps >= max_steps:
+            done = True
+
+    return episode_reward, episode_steps
+
+
+class SequentialEvaluator:
+    """
+    Последовательная оценка с ранней остановкой.
+    После каждого эпизода пересчитывает доверительные интервалы для steps и reward
+    и останавливается, когда:
+      - ширина интервала steps (и reward, если задана) не больше целевой;
+      - или интервал разницы steps с reference целиком выше/ниже нуля
+        (чекпоинт явно лучше/хуже).
+
+    Сравнение с reference проверяется на каждом эпизоде от min_episodes до
+    max_episodes, поэтому уровень одного просмотра — по Бонферрони:
+    1 - (1 - reference_confidence) / число просмотров. Тогда вероятность хотя бы
+    одного ложного "better/worse" за всю оценку не больше 1 - reference_confidence
+    (консервативно). Разброс reference учитывается через его std и n (интервал
+    Уэлча для разницы средних); reference без n считается точным числом.
+    """
+
+    def __init__(
+        self,
+        max_episodes: int,
+        min_episodes: int = 10,
+        confidence: float = 0.95,
+        steps_ci_width: float | None = None,
+        reward_ci_width: float | None = None,
+        reference_steps: float | None = None,
+        reference_std: float = 0.0,
+        reference_n: int | None = None,
+        reference_confidence: float = 0.95,
+    ) -> None:
+        self.max_episodes = max_episodes
+        self.min_episodes = min(min_episodes, max_episodes)
+        self.confidence = confidence
+        self.steps_ci_width = steps_ci_width
+        self.reward_ci_width = reward_ci_width
+        self.reference_steps = reference_steps
+        self.reference_std = reference_std
+        self.reference_n = reference_n
+        self.reference_confidence = reference_confidence
+        looks = max(1, self.max_episodes - self.min_episodes)
+        self.look_confidence = 1 - (1 - reference_confidence) / looks
+
+        self.steps = RunningStats()
+        self.rewards = RunningStats()
+        self.stop_reason = None
+
+    def push(self, reward: float, steps: int) -> bool:
+        """Добавляет результат эпизода. Возвращает True, если пора остановиться."""
+        self.rewards.push(reward)
+        self.steps.push(steps)
+        self.stop_reason = self._check_stop()
+        return self.stop_reason is not None
+
+    def reference_diff_interval(self) -> tuple[float, float]:
+        """Интервал Уэлча для mean(steps) - reference на уровне одного просмотра."""
+        n = self.steps.n
+        if n < 2:
+            return -float("inf"), float("inf")
+        var = self.steps.std ** 2 / n
+        ref_var = self.reference_std ** 2 / self.reference_n if self.reference_n else 0.0
+        df = n - 1
+        if ref_var > 0:
+            # Степени свободы Уэлча–Саттертуэйта
+            df = (var + ref_var) ** 2 / (var ** 2 / (n - 1) + ref_var ** 2 / max(self.reference_n - 1, 1))
+        half = t_value(self.look_confidence, max(1, int(df))) * math.sqrt(var + ref_var)
+        diff = self.steps.mean - self.reference_steps
+        return diff - half, diff + half
+
+    def _check_stop(self) -> str | None:
+        n = self.steps.n
+        if n >= self.max_episodes:
+            return "max_episodes"
+        if n < self.min_episodes:
+            return None
+
+        if self.reference_steps is not None:
+            diff_low, diff_high = self.reference_diff_interval()
+            if diff_low > 0:
+                return "better_than_reference"
+            if diff_high < 0:
+                return "worse_than_reference"
+
+        if self.steps_ci_width is None and self.reward_ci_width is None:
+            return None
+        steps_low, steps_high = self.steps.confidence_interval(self.confidence)
+        if self.steps_ci_width is not None and steps_high - steps_low > self.steps_ci_width:
+            return None
+        if self.reward_ci_width is not None:
+            reward_low, reward_high = self.rewards.confidence_interval(self.confidence)
+            if reward_high - reward_low > self.reward_ci_width:
+                return None
+        return "ci_width"
+
+    def run(self, agent, env_config, max_steps: int, seed: int, on_episode=None) -> dict:
+        """
+        Играет эпизоды 0, 1, ... через evaluate_episode до срабатывания критерия
+        остановки: эпизод n тот же, что в фоновой оценке и турнире с этим seed.
+        """
+        while True:
+            reward, steps = evaluate_episode(agent, env_config, max_steps, seed, self.steps.n)
+            stop = self.push(reward, steps)
+            if on_episode is not None:
+                on_episode(self.steps.n, reward, steps)
+            if stop:
+                return self.summary()
+
+    def summary(self) -> dict:
+        return {
+            "episodes": self.steps.n,
+            "stop_reason": self.stop_reason,
+            "confidence": self.confidence,
+            "reference_steps": self.reference_steps,
+            "reference_confidence": self.reference_confidence,
+            "steps": self.steps.to_dict(self.confidence),
+            "reward": self.rewards.to_dict(self.confidence),
+        }
+
+
+def evaluate_episode(agent, env_config, max_steps: int, seed: int, episode: int) -> tuple[float, int]:
+    """
+    Эпизод episode оценки с root seed: среда и семплирование действий берут свои
+    потоки derive_seed(seed, ..., episode). Результат не зависит от того, какие
+    эпизоды и в каком порядке игрались до него (можно раздавать по воркерам).
+    Семплер тот же, что в run_tournament, поэтому траектории совпадают с турниром.
+    Глобальный RNG torch не используется.
+    """
+    from src.environment.game_env import GameEnv
+
+    env = GameEnv(env_config, derive_seed(seed, "eval_env", episode))
+    generator = torch_generator(derive_seed(seed, "eval_sampler", episode))
+    return play_episode(env, agent, max_steps, generator)
+
+
+def evaluate_state_dict(state_dict, env_config, agent_config, num_episodes: int, max_steps: int, seed: int) -> dict:
+    """
+    Детерминированная оценка весов: эпизоды 0..num_episodes-1 через evaluate_episode.
+    Одинаковые веса всегда дают одинаковый результат; глобальный RNG torch не меняется.
+    """
+    from src.agent.reinforce_agent import ReinforceAgent
+
+    rewards, steps = [], []
+    # Только CPU RNG: иначе fork_rng поднимает CUDA и сохраняет RNG всех устройств
+    with torch.random.fork_rng(devices=[]):
+        agent = ReinforceAgent(agent_config)
+        agent.policy.load_state_dict(state_dict)
+        agent.grid_height = env_config.grid_height
+        agent.state_mode = env_config.state_mode
+
+        for e in range(num_episodes):
+            reward, length = evaluate_episode(agent, env_config, max_steps, seed, e)
+            rewards.append(reward)
+            steps.append(length)
+
+    return {
+        "mean_reward": sum(rewards) / num_episodes,
+        "mean_steps": sum(steps) / num_episodes,
+        "max_steps_ratio": sum(1 for s in steps if s >= max_steps) / num_episodes,
+    }
+
+
+def _eval_worker(requests, results, env_config, agent_config, num_episodes, max_steps, seed) -> None:
+    torch.set_num_threads(1)
+    while True:
+        item = requests.get()
+        if item is None:
+            return
+        episode, state_dict = item
+        result = evaluate_state_dict(state_dict, env_config, agent_config, num_episodes, max_steps, seed)
+        result["episode"] = episode
+        results.put(result)
+
+
+class AsyncEvaluator:
+    """
+    Фоновая оценка снимков весов в отдельном процессе.
+    submit() не блокирует: если воркер ещё занят max_pending снимками, новый снимок
+    пропускается. poll() забирает готовые результаты без ожидания.
+    """
+
+    def __init__(
+        self,
+        env_config,
+        agent_config,
+        num_episodes: int,
+        max_steps: int,
+        seed: int,
+        max_pending: int = 1,
+        start_method: str = "spawn",
+    ) -> None:
+        ctx = mp.get_context(start_method)
+        self.max_pending = max_pending
+        self.pending = 0
+        self._requests = ctx.Queue()
+        self._results = ctx.Queue()
+        self._proc = ctx.Process(
+            target=_eval_worker,
+            args=(self._requests, self._results, env_config, agent_config, num_episodes, max_steps, seed),
+            daemon=True,
+        )
+        self._proc.start()
+
+    def submit(self, episode: int, state_dict: dict) -> bool:
+        """Отправляет снимок на оценку. Возвращает False, если снимок пропущен."""
+        if self.pending >= self.max_pending:
+            return False
+        self._requests.put((episode, state_dict))
+        self.pending += 1
+        return True
+
+    def poll(self, wait: bool = False) -> list[dict]:
+        """Готовые результаты; при wait=True дожидается всех отправленных снимков."""
+        out = []
+        while self.pending > 0:
+            try:
+                result = self._results.get(block=wait, timeout=None if wait else 0)
+            except queue.Empty:
+                break
+            self.pending -= 1
+            out.append(result)
+        return out
+
+    def close(self) -> None:
+        self._requests.put(None)
+        self._proc.join(timeout=10.0)
+        if self._proc.is_alive():
+            self._proc.terminate()
@@ -1,13 +1,17 @@
 import csv
 import os
-import pandas as pd
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import pandas as pd
 
 class Logger:
     """Собирает статистики по эпизодам, пишет CSV и текстовые логи."""
 
-    def __init__(self, stats_path: str, log_path: str | None = None) -> None:
+    def __init__(self, stats_path: str, log_path: str | None = None, verbose: bool = True) -> None:
         """Открывает/создаёт CSV файл, пишет заголовок."""
         self.stats_path = stats_path
+        self.verbose = verbose
         
         # Создаем папку, если её нет
         os.makedirs(os.path.dirname(stats_path), exist_ok=True)
@@ -32,10 +36,13 @@ class Logger:
         
         # Вывод в консоль (каждые N раз можно фильтровать в Trainer, но здесь пишем всё)
         # Форматирование для красоты
-        print(f"Ep: {episode:4d} | Reward: {total_reward:6.1f} | Steps: {episode_length:4d} | Loss: {loss:7.4f}")
+        if self.verbose:
+            print(f"Ep: {episode:4d} | Reward: {total_reward:6.1f} | Steps: {episode_length:4d} | Loss: {loss:7.4f}")
 
     def get_dataframe(self) -> "pd.DataFrame":
         """Читает CSV и возвращает pandas DataFrame."""
+        # pandas импортируется лениво: при обучении он не нужен
+        import pandas as pd
         if os.path.exists(self.stats_path):
             return pd.read_csv(self.stats_path)
         return pd.DataFrame()
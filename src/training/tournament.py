@@ -0,0 +1,86 @@
+import numpy as np
+import torch
+from src.environment.game_env import GameEnv
+from src.utils.seed import derive_seed, sample_actions, torch_generator
+from src.utils.stats import RunningStats
+
+
+def run_tournament(
+    policy,
+    env_config,
+    num_episodes: int,
+    max_steps: int,
+    seed: int,
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Играет num_episodes эпизодов для каждой из N моделей StackedPolicyNetwork в lockstep.
+    Эпизод e у всех моделей использует одну и ту же среду и одни и те же случайные
+    числа для семплирования действия — парный дизайн (common random numbers).
+    Потоки и семплер эпизода e — те же, что у evaluate_episode(seed, e), и не зависят от num_episodes.
+    Один forward на шаг для всех N * num_episodes активных игр.
+    Возвращает (rewards, steps) shape (N, num_episodes).
+    """
+    n_models = policy.num_models
+    env_seeds = [derive_seed(seed, "eval_env", e) for e in range(num_episodes)]
+    envs = [[GameEnv(env_config, s) for s in env_seeds] for _ in range(n_models)]
+    states = np.stack([[env.reset() for env in row] for row in envs])  # (N, E, state_dim)
+
+    rewards = np.zeros((n_models, num_episodes), dtype=np.float64)
+    steps = np.zeros((n_models, num_episodes), dtype=np.int64)
+    active = np.ones((n_models, num_episodes), dtype=bool)
+    generators = [torch_generator(derive_seed(seed, "eval_sampler", e)) for e in range(num_episodes)]
+
+    while active.any():
+        with torch.no_grad():
+            probs = policy(torch.from_numpy(states))
+        # Общее равномерное число на эпизод: одинаковые вероятности -> одинаковое действие
+        u = torch.cat([torch.rand(1, generator=g) for g in generators])
+        actions = sample_actions(probs, u=u).numpy()
+
+        for i, e in zip(*np.nonzero(active)):
+            state, reward, done, _ = envs[i][e].step(int(actions[i, e]))
+            states[i, e] = state
+            rewards[i, e] += reward
+            steps[i, e] += 1
+            if done or steps[i, e] >= max_steps:
+                active[i, e] = False
+
+    return rewards, steps
+
+
+def rank_results(
+    names: list[str],
+    rewards: np.ndarray,
+    steps: np.ndarray,
+    confidence: float = 0.95,
+) -> list[dict]:
+    """
+    Ранжирует модели по среднему числу шагов (затем по награде).
+    Для каждой модели считает парную разницу steps с лидером на тех же эпизодах:
+    среднее, доверительный интервал и доли побед/ничьих/поражений.
+    """
+    order = sorted(range(len(names)), key=lambda i: (steps[i].mean(), rewards[i].mean()), reverse=True)
+    leader = order[0]
+
+    table = []
+    for rank, i in enumerate(order, start=1):
+        steps_stats, reward_stats, diff_stats = RunningStats(), RunningStats(), RunningStats()
+        for s, r, d in zip(steps[i], rewards[i], steps[i] - steps[leader]):
+            steps_stats.push(float(s))
+            reward_stats.push(float(r))
+            diff_stats.push(float(d))
+
+        diff = steps[i] - steps[leader]
+        table.append({
+            "rank": rank,
+            "name": names[i],
+            "steps": steps_stats.to_dict(confidence),
+            "reward": reward_stats.to_dict(confidence),
+            "vs_leader": {
+                "steps_diff": diff_stats.to_dict(confidence),
+                "win_rate": float((diff > 0).mean()),
+                "tie_rate": float((diff == 0).mean()),
+                "loss_rate": float((diff < 0).mean()),
+            },
+        })
+    return table
@@ -1,5 +1,6 @@
 import torch
 import os
+import time
 import numpy as np
 from collections import deque
 from src.environment.game_env import GameEnv
@@ -7,15 +8,21 @@ from src.agent.reinforce_agent import ReinforceAgent
 from src.training.logger import Logger
 
 class Trainer:
-    def __init__(self, env, agent, train_config, logger) -> None:
+    def __init__(self, env, agent, train_config, logger, evaluator=None) -> None:
         self.env = env
         self.agent = agent
         self.cfg = train_config
         self.logger = logger
+        # AsyncEvaluator: если задан, best.pt и early stop определяются фоновой оценкой
+        self.evaluator = evaluator
+        self.eval_snapshots = {}
+        self.best_eval = None
+        self.last_eval_episode = None
         
-        # Set grid height and state mode on agent for baseline computation
+        # Set grid height, state and reward mode on agent for baseline computation
         self.agent.grid_height = env.cfg.grid_height
         self.agent.state_mode = env.cfg.state_mode
+        self.agent.reward_mode = env.cfg.reward_mode
         
         # Начинаем с очень низкого значения
         self.best_reward = -float('inf')
@@ -24,19 +31,33 @@ class Trainer:
         self.early_stop_window = getattr(self.cfg, 'early_stop_window', 30)
         self.early_stop_threshold = getattr(self.cfg, 'early_stop_threshold', 0.8)
         self.recent_steps = deque(maxlen=self.early_stop_window)
+        # Loss усечённых обновлений внутри текущего эпизода
+        self.chunk_losses = []
 
         os.makedirs(self.cfg.checkpoint_dir, exist_ok=True)
 
     def train(self) -> dict:
+        """
+        Возвращает сводку запуска: episodes, env_steps, wall_time, steps_per_sec
+        и converged (сработал ли критерий ранней остановки).
+        """
         print(f"Starting training for {self.cfg.num_episodes} episodes...")
         
         running_reward = 0.0
+        self.total_steps = 0
+        self.start_time = time.perf_counter()
         
         for episode in range(1, self.cfg.num_episodes + 1):
+            self.chunk_losses = []
             reward, steps = self.run_episode()
+            self.total_steps += steps
             
             # Обновляем сеть
             loss = self.agent.update_policy()
+            if self.chunk_losses:
+                # Усечённые обновления: в лог идёт средний loss по отрезкам эпизода
+                self.chunk_losses.append(loss)
+                loss = sum(self.chunk_losses) / len(self.chunk_losses)
             
             # Более быстрое обновление среднего (0.9 вместо 0.95), чтобы видеть прогресс
             if episode == 1:
@@ -48,6 +69,15 @@ class Trainer:
             if episode % self.cfg.log_every == 0:
                 self.logger.log_episode(episode, running_reward, steps, loss)
                 
+            if self.evaluator is not None:
+                if self.handle_evaluation(episode):
+                    print(f"Early stop at episode {episode}: evaluation reached max steps.")
+                    self.save_model("last.pt")
+                    return self.summary(episode, converged=True)
+                if episode % self.cfg.checkpoint_every == 0:
+                    self.save_model("last.pt")
+                continue
+
             # Сохраняем "Лучшую" модель
             # Используем running_reward, чтобы отсеять случайные удачи
             if running_reward > self.best_reward and episode > 100:
@@ -73,11 +103,68 @@ class Trainer:
                         f"episodes reached max steps ({self.cfg.max_steps_per_episode})."
                     )
                     self.save_model("last.pt")
-                    return {}
+                    return self.summary(episode, converged=True)
                 
         self.save_model("last.pt")
+        if self.evaluator is not None:
+            self.finish_evaluation(self.cfg.num_episodes)
         print("Training finished.")
-        return {}
+        return self.summary(self.cfg.num_episodes, converged=False)
+
+    def handle_evaluation(self, episode: int) -> bool:
+        """
+        Применяет готовые результаты и отправляет снимок весов на фоновую оценку
+        (каждые eval_every эпизодов). Сначала poll: иначе воркер, закончивший после
+        прошлого poll, всё ещё считался бы занятым и снимок был бы пропущен.
+        Возвращает True, если пора остановиться.
+        """
+        stop = False
+        for result in self.evaluator.poll():
+            stop = self.apply_eval_result(result) or stop
+
+        if episode % self.cfg.eval_every == 0:
+            self.submit_snapshot(episode)
+        return stop
+
+    def submit_snapshot(self, episode: int) -> None:
+        snapshot = {k: v.detach().clone() for k, v in self.agent.policy.state_dict().items()}
+        if self.evaluator.submit(episode, snapshot):
+            self.eval_snapshots[episode] = snapshot
+
+    def finish_evaluation(self, episode: int) -> None:
+        """
+        Дожидается оценок в работе, чтобы best.pt их учитывал. Если последние веса
+        не оценивались (в том числе при eval_every > num_episodes), оценивает и их:
+        без этого best.pt мог бы не появиться вовсе.
+        """
+        for result in self.evaluator.poll(wait=True):
+            self.apply_eval_result(result)
+        if self.last_eval_episode != episode:
+            self.submit_snapshot(episode)
+            for result in self.evaluator.poll(wait=True):
+                self.apply_eval_result(result)
+
+    def apply_eval_result(self, result: dict) -> bool:
+        snapshot = self.eval_snapshots.pop(result["episode"])
+        self.last_eval_episode = result["episode"]
+        score = (result["mean_reward"], result["mean_steps"])
+        if self.best_eval is None or score > (self.best_eval["mean_reward"], self.best_eval["mean_steps"]):
+            self.best_eval = result
+            torch.save(snapshot, os.path.join(self.cfg.checkpoint_dir, "best.pt"))
+            print(f"--> New Best Model (eval @ ep {result['episode']})! "
+                  f"Reward: {result['mean_reward']:.2f} | Steps: {result['mean_steps']:.1f}")
+        return result["max_steps_ratio"] >= self.early_stop_threshold
+
+    def summary(self, episodes: int, converged: bool) -> dict:
+        wall_time = time.perf_counter() - self.start_time
+        return {
+            "episodes": episodes,
+            "env_steps": self.total_steps,
+            "wall_time": wall_time,
+            "steps_per_sec": self.total_steps / wall_time if wall_time > 0 else 0.0,
+            "converged": converged,
+            "best_eval": self.best_eval,
+        }
 
     def run_episode(self) -> tuple[float, int]:
         state = self.env.reset()
@@ -100,6 +187,9 @@ class Trainer:
             
             if steps >= self.cfg.max_steps_per_episode:
                 done = True
+            elif not done and self.agent.chunk_full():
+                # Память агента ограничена отрезком, а не длиной эпизода
+                self.chunk_losses.append(self.agent.update_policy(next_state=state))
 
         return total_reward, steps
 
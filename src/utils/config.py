@@ -12,8 +12,8 @@ class EnvConfig:
 
     state_mode: str = "absolute" # "absolute" или "relative"
     reward_mode: str = "basic" # "basic" или "enhanced"
-    # seed для генератора случайных чисел в game_env.py
-    seed = 42
+    # seed для генератора случайных чисел в game_env.py (если GameEnv создан без seed)
+    seed: int = 42
 
 
 @dataclass
@@ -27,6 +27,17 @@ class AgentConfig:
     use_normalization: bool = True
     entropy_coef: float = 0.0 # 0.0 для отключения
     use_height_baseline: bool = False
+    # torch.compile для update_policy (паддинг до бакетов длины, fallback на eager)
+    compile_update: bool = False
+    # Повторное использование эпизодов (0 — обычный REINFORCE)
+    reuse_epochs: int = 0
+    reuse_buffer_size: int = 4
+    clip_ratio: float = 0.2
+    max_kl: float = 0.02
+    # Усечённые обновления каждые truncate_steps шагов (0 — раз в эпизод);
+    # хвост отрезка оценивается аналитическим baseline
+    truncate_steps: int = 0
+    truncate_bootstrap: bool = True
 
 @dataclass
 class TrainConfig:
@@ -40,8 +51,11 @@ class TrainConfig:
     checkpoint_dir: str = ""
     early_stop_window: int = 50
     early_stop_threshold: float = 0.8
-    # 
-    seed = 42
+    # Фоновая оценка снимков весов (0 — выключена, best.pt по running_reward)
+    eval_every: int = 0
+    eval_episodes: int = 10
+    # root seed запуска (set_global_seed / derive_seed); оценка берёт из него потоки eval_*
+    seed: int = 42
 
 @dataclass
 class RenderConfig:
@@ -2,9 +2,52 @@ import random
 import numpy as np
 import torch
 
+# Номера независимых потоков случайных чисел, выводимых из одного root seed
+STREAMS = {
+    "env": 0,           # среды обучения (по индексу среды)
+    "sampler": 1,       # семплирование действий при обучении
+    "eval_env": 2,      # среды оценки (по номеру эпизода)
+    "eval_sampler": 3,  # семплирование действий при оценке (по номеру эпизода)
+}
+
 def set_global_seed(seed: int) -> None:
     """Фиксирует seed для random, numpy, torch (кроме game_env.py в np.random.default_rng)"""
 
     random.seed(seed)
     np.random.seed(seed)
-    torch.manual_seed(seed)
\ No newline at end of file
+    torch.manual_seed(seed)
+
+def derive_seed(root_seed: int, stream: str, *index: int) -> int:
+    """
+    Seed дочернего потока (stream, index...) из root_seed через np.random.SeedSequence.
+    Зависит только от этого пути, а не от порядка вызовов, числа воркеров или
+    батчинга, поэтому параллельный запуск воспроизводит последовательный бит в бит.
+    Разные root_seed не дают пересекающихся потоков (в отличие от seed + i).
+    """
+    seq = np.random.SeedSequence(root_seed, spawn_key=(STREAMS[stream], *index))
+    return int(seq.generate_state(1, dtype=np.uint64)[0]) >> 1  # int64 для torch.manual_seed
+
+def training_seeds(root_seed: int) -> tuple[int, int]:
+    """
+    (env_seed, sampler_seed) запуска обучения с root_seed. Веса инициализируются
+    после set_global_seed(root_seed); run/train.py и run/train_ensemble.py берут
+    среду и семплирование из этих потоков и стартуют одинаково (дальше ансамбль
+    расходится из-за округления batched-арифметики, см. EnsembleTrainer).
+    """
+    return derive_seed(root_seed, "env"), derive_seed(root_seed, "sampler")
+
+def torch_generator(seed: int) -> torch.Generator:
+    """Отдельный torch.Generator, не затрагивающий глобальный RNG."""
+    return torch.Generator().manual_seed(seed)
+
+def sample_actions(probs: torch.Tensor, generator: torch.Generator | None = None, u: torch.Tensor | None = None) -> torch.Tensor:
+    """
+    Единый семплер действий обучения, оценки, турнира и ансамбля: inverse-CDF
+    по одному равномерному числу torch.rand(1, generator) на вызов (generator=None —
+    глобальный RNG). u можно передать заранее (общее число для нескольких моделей);
+    оно транслируется на probs.shape[:-1]. Возвращает индексы действий shape probs.shape[:-1].
+    """
+    if u is None:
+        u = torch.rand(1, generator=generator)
+    cdf = probs.cumsum(dim=-1)
+    return (cdf < u.unsqueeze(-1)).sum(dim=-1).clamp(max=probs.shape[-1] - 1)
@@ -0,0 +1,133 @@
+import math
+from functools import lru_cache
+from statistics import NormalDist
+import numpy as np
+
+
+def z_value(confidence: float) -> float:
+    """Двусторонний квантиль нормального распределения для уровня доверия."""
+    return NormalDist().inv_cdf(0.5 + confidence / 2)
+
+
+def _t_central_prob(t: float, df: int) -> float:
+    """P(|T| < t) для распределения Стьюдента с целым df (замкнутая формула через θ = atan(t / sqrt(df)))."""
+    theta = math.atan(t / math.sqrt(df))
+    c2 = math.cos(theta) ** 2
+    if df % 2 == 1:
+        term, total = 1.0, 1.0 if df > 1 else 0.0
+        for k in range(1, (df - 3) // 2 + 1):
+            term *= c2 * (2 * k) / (2 * k + 1)
+            total += term
+        return 2 / math.pi * (theta + (math.sin(theta) * math.cos(theta) * total if df > 1 else 0.0))
+    term, total = 1.0, 1.0
+    for k in range(1, (df - 2) // 2 + 1):
+        term *= c2 * (2 * k - 1) / (2 * k)
+        total += term
+    return math.sin(theta) * total
+
+
+@lru_cache(maxsize=None)
+def t_value(confidence: float, df: int) -> float:
+    """
+    Двусторонний квантиль t-распределения (бисекция по _t_central_prob).
+    При большом df совпадает с z_value.
+    """
+    if df >= 1000:
+        return z_value(confidence)
+    low, high = 0.0, 1.0
+    while _t_central_prob(high, df) < confidence:
+        high *= 2
+    for _ in range(100):
+        mid = (low + high) / 2
+        if _t_central_prob(mid, df) < confidence:
+            low = mid
+        else:
+            high = mid
+    return (low + high) / 2
+
+
+class RunningStats:
+    """
+    Онлайн-оценка среднего и дисперсии (алгоритм Уэлфорда)
+    с доверительным интервалом Стьюдента для среднего.
+    """
+
+    def __init__(self) -> None:
+        self.n = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+        self.min = float("inf")
+        self.max = -float("inf")
+
+    def push(self, x: float) -> None:
+        self.n += 1
+        delta = x - self.mean
+        self.mean += delta / self.n
+        self._m2 += delta * (x - self.mean)
+        self.min = min(self.min, x)
+        self.max = max(self.max, x)
+
+    @property
+    def std(self) -> float:
+        """Выборочное стандартное отклонение (ddof=1)."""
+        if self.n < 2:
+            return 0.0
+        return math.sqrt(self._m2 / (self.n - 1))
+
+    def confidence_interval(self, confidence: float = 0.95) -> tuple[float, float]:
+        """
+        Интервал mean ± t(n-1) * std / sqrt(n). При n < 2 — бесконечный.
+        Квантиль Стьюдента (а не z) не даёт интервалу быть слишком узким на малых n,
+        где срабатывает последовательная остановка.
+        """
+        if self.n < 2:
+            return -float("inf"), float("inf")
+        half = t_value(confidence, self.n - 1) * self.std / math.sqrt(self.n)
+        return self.mean - half, self.mean + half
+
+    def to_dict(self, confidence: float = 0.95) -> dict:
+        # JSON не поддерживает inf, поэтому неопределённый интервал — None
+        low, high = self.confidence_interval(confidence)
+        if self.n < 2:
+            low, high = None, None
+        return {
+            "n": self.n,
+            "mean": self.mean,
+            "std": self.std,
+            "min": self.min,
+            "max": self.max,
+            "ci_low": low,
+            "ci_high": high,
+        }
+
+
+def bootstrap_ci(
+    values,
+    confidence: float = 0.95,
+    n_resamples: int = 2000,
+    seed: int = 0,
+) -> tuple[float, float]:
+    """Перцентильный bootstrap-интервал для среднего."""
+    values = np.asarray(values, dtype=np.float64)
+    if len(values) < 2:
+        return float("nan"), float("nan")
+    rng = np.random.default_rng(seed)
+    idx = rng.integers(0, len(values), size=(n_resamples, len(values)))
+    means = values[idx].mean(axis=1)
+    alpha = (1 - confidence) / 2
+    return float(np.quantile(means, alpha)), float(np.quantile(means, 1 - alpha))
+
+
+def bootstrap_paired_diff_ci(
+    a,
+    b,
+    confidence: float = 0.95,
+    n_resamples: int = 2000,
+    seed: int = 0,
+) -> tuple[float, float]:
+    """Bootstrap-интервал для mean(a - b) по парам (a[i], b[i]) — например, одинаковые seed'ы."""
+    a = np.asarray(a, dtype=np.float64)
+    b = np.asarray(b, dtype=np.float64)
+    if len(a) != len(b):
+        raise ValueError(f"paired samples must have equal length ({len(a)} != {len(b)})")
+    return bootstrap_ci(a - b, confidence, n_resamples, seed)
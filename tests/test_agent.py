@@ -1,4 +1,152 @@
+import numpy as np
+import torch
+
+from src.agent.reinforce_agent import ReinforceAgent
+from src.utils.config import AgentConfig
+
+
+def play_synthetic_episode(agent, length, seed=0):
+    rng = np.random.default_rng(seed)
+    for t in range(length):
+        state = np.array([rng.integers(0, 6), 1, 2, rng.integers(0, 12)], dtype=np.float32)
+        agent.select_action(state)
+        agent.store_reward(1.0 if t % 12 == 11 else 0.0)
+
+
 class TestReinforceAgent:
     def test_select_action_returns_valid(self): ...
     def test_compute_returns_correctness(self): ...
-    def test_save_load_roundtrip(self): ...
\ No newline at end of file
+    def test_save_load_roundtrip(self): ...
+
+
+class TestPaddedUpdate:
+    def test_padded_update_matches_eager(self):
+        agents = []
+        for padded in (False, True):
+            torch.manual_seed(0)
+            agent = ReinforceAgent(AgentConfig(entropy_coef=0.01))
+            # Паддинг + маска без torch.compile (та же математика, что в compile-режиме)
+            agent.compile_update = padded
+            play_synthetic_episode(agent, 37)
+            agent.update_policy()
+            agents.append(agent)
+
+        for p_eager, p_padded in zip(agents[0].policy.parameters(), agents[1].policy.parameters()):
+            assert torch.allclose(p_eager, p_padded, atol=1e-6)
+
+    def test_compiled_update_matches_eager(self):
+        agents = []
+        for compiled in (False, True):
+            torch.manual_seed(0)
+            agent = ReinforceAgent(AgentConfig(entropy_coef=0.01, compile_update=compiled))
+            for seed in range(2):
+                play_synthetic_episode(agent, 37, seed=seed)
+                agent.update_policy()
+            if compiled:
+                # Ошибка компиляции откатывает на eager с теми же числами — проверяем, что отката не было
+                assert agent._loss_fn != agent._masked_loss
+                assert agent._step_fn != agent._clip_and_step
+            agents.append(agent)
+
+        for p_eager, p_compiled in zip(agents[0].policy.parameters(), agents[1].policy.parameters()):
+            assert torch.allclose(p_eager, p_compiled, atol=1e-6)
+
+    def test_eager_mode_does_not_keep_states(self):
+        agent = ReinforceAgent(AgentConfig())
+        play_synthetic_episode(agent, 10)
+        assert agent.states == [] and agent.actions == []
+
+    def test_bucket_length(self):
+        assert ReinforceAgent.bucket_length(10) == 64
+        assert ReinforceAgent.bucket_length(64) == 64
+        assert ReinforceAgent.bucket_length(2000) == 2048
+
+
+class TestSampleReuse:
+    def test_single_epoch_single_episode_matches_reinforce(self):
+        agents = []
+        for reuse in (0, 1):
+            torch.manual_seed(0)
+            agent = ReinforceAgent(AgentConfig(entropy_coef=0.01, reuse_epochs=reuse, reuse_buffer_size=1))
+            play_synthetic_episode(agent, 30)
+            agent.update_policy()
+            agents.append(agent)
+
+        for p_plain, p_reuse in zip(agents[0].policy.parameters(), agents[1].policy.parameters()):
+            assert torch.allclose(p_plain, p_reuse, atol=1e-6)
+
+    def test_buffer_is_bounded(self):
+        agent = ReinforceAgent(AgentConfig(reuse_epochs=3, reuse_buffer_size=2))
+        for seed in range(4):
+            play_synthetic_episode(agent, 20, seed=seed)
+            agent.update_policy()
+        assert len(agent.replay) == 2
+        assert agent.states == [] and agent.actions == []
+
+
+    def test_select_action_keeps_no_graph(self):
+        agent = ReinforceAgent(AgentConfig(reuse_epochs=2))
+        play_synthetic_episode(agent, 10)
+        assert agent.log_probs == [] and agent.entropies == []
+        assert len(agent.states) == 10 and not agent.states[0].requires_grad
+
+    def test_kl_guard_ignores_stale_behavior_policy(self):
+        torch.manual_seed(0)
+        agent = ReinforceAgent(AgentConfig(learning_rate=0.003, reuse_epochs=4, reuse_buffer_size=4))
+        optimizer_step = agent.optimizer.step
+        steps = []
+
+        def counting_step(*args, **kwargs):
+            steps[-1] += 1
+            return optimizer_step(*args, **kwargs)
+
+        agent.optimizer.step = counting_step
+        for seed in range(8):
+            steps.append(0)
+            play_synthetic_episode(agent, 40, seed=seed)
+            agent.update_policy()
+        # Буфер полон устаревших эпизодов, но эпохи не обрываются на первой же проверке
+        assert sum(steps[4:]) > 4
+
+
+class TestTruncatedUpdate:
+    def test_bootstrap_enters_returns(self):
+        agent = ReinforceAgent(AgentConfig(use_normalization=False))
+        advantages = agent.compute_advantages([0.0, 1.0], [0.0, 0.0], bootstrap=2.0)
+        gamma = agent.gamma
+        assert torch.allclose(advantages, torch.tensor([gamma * (1.0 + gamma * 2.0), 1.0 + gamma * 2.0]))
+
+    def test_no_bootstrap_for_enhanced_rewards(self):
+        agent = ReinforceAgent(AgentConfig(truncate_steps=16))
+        state = np.array([3, 1, 2, 7], dtype=np.float32)
+        assert agent.bootstrap_value(state) != 0.0
+        agent.reward_mode = "enhanced"
+        assert agent.bootstrap_value(state) == 0.0
+
+    def test_buffers_bounded_by_chunk(self):
+        agent = ReinforceAgent(AgentConfig(truncate_steps=16))
+        rng = np.random.default_rng(0)
+        peak = 0
+        for t in range(200):
+            state = np.array([rng.integers(0, 6), 1, 2, rng.integers(0, 12)], dtype=np.float32)
+            agent.select_action(state)
+            agent.store_reward(0.0)
+            peak = max(peak, len(agent.log_probs))
+            if agent.chunk_full():
+                agent.update_policy(next_state=state)
+        assert peak == 16
+        assert len(agent.rewards) == 200 % 16
+
+    def test_one_step_tail_is_trained(self):
+        torch.manual_seed(0)
+        agent = ReinforceAgent(AgentConfig(truncate_steps=4, use_normalization=True))
+        play_synthetic_episode(agent, 4)
+        agent.update_policy(next_state=np.array([3, 1, 2, 7], dtype=np.float32))
+
+        before = [p.detach().clone() for p in agent.policy.parameters()]
+        agent.select_action(np.array([3, 1, 2, 0], dtype=np.float32))
+        agent.store_reward(-10.0)
+        loss = agent.update_policy()
+
+        assert loss != 0.0
+        assert any(not torch.equal(b, p) for b, p in zip(before, agent.policy.parameters()))
@@ -0,0 +1,31 @@
+from argparse import Namespace
+
+from run.bench_convergence import compare, summarize
+
+ARGS = Namespace(confidence=0.95, bootstrap=500)
+
+
+def make_run(seed, env_steps, converged=True):
+    return {"seed": seed, "episodes": env_steps // 100, "env_steps": env_steps,
+            "wall_time": env_steps / 1000, "steps_per_sec": 1000.0, "converged": converged}
+
+
+class TestConvergenceSummary:
+    def test_capped_runs_are_censored(self):
+        runs = [make_run(1, 1000), make_run(2, 2000), make_run(3, 100_000, converged=False)]
+        summary = summarize(runs, ARGS)
+        assert summary["converged"] == 2 and summary["censored"] == 1
+        assert summary["env_steps"]["mean"] == 1500
+
+    def test_paired_comparison_by_seed(self):
+        reference = [make_run(s, 1000 * s) for s in range(1, 9)]
+        current = [make_run(s, 1000 * s - 100) for s in reversed(range(1, 9))]
+        result = compare(current, reference, ARGS)
+        assert result["paired_converged"] == 8
+        assert result["verdict"] == "faster in samples and seconds"
+
+    def test_more_capped_runs_is_not_faster(self):
+        reference = [make_run(s, 1000 * s) for s in range(1, 9)]
+        current = [make_run(s, 1000 * s - 100, converged=s > 2) for s in range(1, 9)]
+        result = compare(current, reference, ARGS)
+        assert result["verdict"] == "slower"
@@ -0,0 +1,55 @@
+import math
+import sys
+from argparse import Namespace
+
+from run.bench_scaling import axis_rows, base_point, peak_rss_mb, plot, scaling_exponent, sweep_points, write_report
+
+
+def make_args(mode, widths=(6, 12), heights=(12,), block_widths=(2, 8), max_steps=(2000,)):
+    return Namespace(mode=mode, grid_widths=list(widths), grid_heights=list(heights),
+                     block_max_widths=list(block_widths), max_steps=list(max_steps))
+
+
+class TestSweepPoints:
+    def test_axis_mode_varies_one_dimension(self):
+        base = base_point()
+        points = sweep_points(make_args("axis", widths=(6, 12, 24), block_widths=(2, 4)))
+        assert points[0] == base
+        for p in points[1:]:
+            assert sum(p[d] != base[d] for d in base) == 1
+        assert {p["grid_width"] for p in points} == {6, 12, 24}
+
+    def test_grid_mode_skips_blocks_wider_than_grid(self):
+        points = sweep_points(make_args("grid", widths=(6, 12), block_widths=(2, 8)))
+        # (6, 8) выкинута: блок шире поля
+        assert len(points) == 3
+        assert all(p["block_max_width"] <= p["grid_width"] for p in points)
+
+
+class TestScalingAnalysis:
+    def test_axis_rows_keep_other_dimensions_at_base(self):
+        base = base_point()
+        results = [{**base, "grid_width": 12}, base, {**base, "grid_width": 24, "grid_height": 24}]
+        rows = axis_rows(results, "grid_width")
+        assert [r["grid_width"] for r in rows] == [6, 12]
+
+    def test_scaling_exponent(self):
+        rows = [{"max_steps_per_episode": n, "update_ms": 0.5 * n ** 1.5} for n in (1000, 2000, 4000)]
+        assert math.isclose(scaling_exponent(rows, "max_steps_per_episode", "update_ms"), 1.5)
+        assert scaling_exponent(rows[:1], "max_steps_per_episode", "update_ms") is None
+
+    def test_peak_rss_in_megabytes(self):
+        assert 1 < peak_rss_mb() < 100_000
+
+    def test_report_without_matplotlib(self, tmp_path, monkeypatch):
+        base = base_point()
+        metrics = {"env_steps_per_sec": 1000.0, "select_action_us": 50.0, "update_ms": 2.0,
+                   "base_rss_mb": 100.0, "peak_rss_mb": 120.0}
+        results = [{**base, **metrics}, {**base, "grid_width": 12, **metrics}]
+        monkeypatch.setitem(sys.modules, "matplotlib", None)
+
+        plots = plot(results, str(tmp_path))
+        args = Namespace(mode="axis", compile=False, threads=1, out_dir=str(tmp_path))
+        report = write_report(results, plots, args)
+        assert plots == []
+        assert "Scaling exponents" in open(report).read()
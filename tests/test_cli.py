@@ -0,0 +1,29 @@
+import subprocess
+import sys
+
+import pytest
+
+from run.bench_startup import measure
+from src.cli import COMMANDS
+
+
+class TestCliStartup:
+    @pytest.mark.parametrize("command", list(COMMANDS))
+    def test_help_does_not_import_heavy_modules(self, command):
+        _, heavy, returncode = measure([command, "--help"], repeats=1)
+        assert returncode == 0
+        assert heavy == []
+
+    def test_training_path_does_not_import_pandas_or_pygame(self):
+        code = (
+            "import sys\n"
+            "from src.training.trainer import Trainer\n"
+            "from src.training.logger import Logger\n"
+            "print('pandas' in sys.modules, 'pygame' in sys.modules)\n"
+        )
+        out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+        assert out.stdout.split() == ["False", "False"]
+
+    def test_unknown_command(self):
+        from src.cli import main
+        assert main(["no-such-command"]) == 2
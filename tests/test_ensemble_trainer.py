@@ -0,0 +1,102 @@
+import pandas as pd
+import torch
+
+from src.agent.reinforce_agent import ReinforceAgent
+from src.environment.game_env import GameEnv
+from src.environment.vector_env import SubprocVectorEnv, SyncVectorEnv
+from src.training.ensemble_trainer import BatchedAdam, EnsembleTrainer
+from src.training.logger import Logger
+from src.training.trainer import Trainer
+from src.utils.config import AgentConfig, EnvConfig, TrainConfig
+from src.utils.seed import set_global_seed, torch_generator, training_seeds
+
+
+def make_train_config(tmp_path, name):
+    return TrainConfig(
+        num_episodes=15,
+        stats_path=str(tmp_path / name / "stats.csv"),
+        checkpoint_dir=str(tmp_path / name / "checkpoints"),
+    )
+
+
+class TestBatchedAdam:
+    def test_matches_torch_adam_per_member(self):
+        torch.manual_seed(0)
+        p = torch.nn.Parameter(torch.randn(2, 3, 4))
+        ref = [torch.nn.Parameter(p[i].detach().clone()) for i in range(2)]
+        ref_opts = [torch.optim.Adam([r], lr=0.01) for r in ref]
+        opt = BatchedAdam([p], lr=0.01)
+
+        for step in range(3):
+            grad = torch.randn(2, 3, 4)
+            p.grad = grad.clone()
+            # Второй участник делает шаг только на первой итерации
+            members = [0, 1] if step == 0 else [0]
+            opt.step(torch.tensor(members))
+            for i in members:
+                ref[i].grad = grad[i].clone()
+                ref_opts[i].step()
+
+        for i in range(2):
+            assert torch.allclose(p[i], ref[i], atol=1e-6)
+
+
+class TestEnsembleTrainer:
+    def test_starts_like_separate_runs(self, tmp_path):
+        # Одинаковый старт и та же схема обновления: первые эпизоды совпадают.
+        # На длинных запусках траектории расходятся из-за округления batched-арифметики,
+        # поэтому проверяется только начало, а не весь запуск до early stop.
+        seeds = [1, 2]
+        env_cfg, agent_cfg = EnvConfig(), AgentConfig()
+
+        for seed in seeds:
+            set_global_seed(seed)
+            cfg = make_train_config(tmp_path, f"sep{seed}")
+            agent = ReinforceAgent(agent_cfg)
+            env_seed, sampler_seed = training_seeds(seed)
+            torch.manual_seed(sampler_seed)
+            env = GameEnv(env_cfg, env_seed)
+            Trainer(env, agent, cfg, Logger(cfg.stats_path, verbose=False)).train()
+
+        agents, cfgs, loggers, generators = [], [], [], []
+        for seed in seeds:
+            cfgs.append(make_train_config(tmp_path, f"ens{seed}"))
+            set_global_seed(seed)
+            agents.append(ReinforceAgent(agent_cfg))
+            generators.append(torch_generator(training_seeds(seed)[1]))
+            loggers.append(Logger(cfgs[-1].stats_path, verbose=False))
+        vec_env = SyncVectorEnv(env_cfg, [training_seeds(seed)[0] for seed in seeds], autoreset=False)
+        EnsembleTrainer(vec_env, agents, cfgs, loggers, generators).train()
+
+        for seed in seeds:
+            sep = pd.read_csv(tmp_path / f"sep{seed}" / "stats.csv")
+            ens = pd.read_csv(tmp_path / f"ens{seed}" / "stats.csv")
+            assert (sep["episode_length"] == ens["episode_length"]).all()
+            assert (abs(sep["loss"] - ens["loss"]) < 1e-3).all()
+
+    def test_subproc_pipeline_matches_sync(self, tmp_path):
+        seeds = [1, 2, 3]
+        env_cfg, agent_cfg = EnvConfig(), AgentConfig()
+
+        for kind in ("sync", "subproc"):
+            agents, cfgs, loggers, generators = [], [], [], []
+            for seed in seeds:
+                cfgs.append(make_train_config(tmp_path, f"{kind}{seed}"))
+                set_global_seed(seed)
+                agents.append(ReinforceAgent(agent_cfg))
+                generators.append(torch_generator(training_seeds(seed)[1]))
+                loggers.append(Logger(cfgs[-1].stats_path, verbose=False))
+            env_seeds = [training_seeds(seed)[0] for seed in seeds]
+            if kind == "sync":
+                vec_env = SyncVectorEnv(env_cfg, env_seeds, autoreset=False)
+            else:
+                vec_env = SubprocVectorEnv(env_cfg, env_seeds, num_workers=2, autoreset=False)
+            try:
+                EnsembleTrainer(vec_env, agents, cfgs, loggers, generators).train()
+            finally:
+                vec_env.close()
+
+        for seed in seeds:
+            sync = pd.read_csv(tmp_path / f"sync{seed}" / "stats.csv")
+            subproc = pd.read_csv(tmp_path / f"subproc{seed}" / "stats.csv")
+            assert (sync["episode_length"] == subproc["episode_length"]).all()
@@ -0,0 +1,83 @@
+import os
+import time
+
+import torch
+
+from src.agent.policy_network import PolicyNetwork
+from src.agent.reinforce_agent import ReinforceAgent
+from src.environment.game_env import GameEnv
+from src.training.evaluation import AsyncEvaluator, evaluate_state_dict
+from src.training.logger import Logger
+from src.training.trainer import Trainer
+from src.utils.config import AgentConfig, EnvConfig, TrainConfig
+
+
+class TestEvaluation:
+    def test_evaluate_state_dict_is_deterministic(self):
+        torch.manual_seed(0)
+        sd = PolicyNetwork(4, 128, 3).state_dict()
+        rng_state = torch.get_rng_state()
+
+        a = evaluate_state_dict(sd, EnvConfig(), AgentConfig(), num_episodes=3, max_steps=200, seed=5)
+        b = evaluate_state_dict(sd, EnvConfig(), AgentConfig(), num_episodes=3, max_steps=200, seed=5)
+        assert a == b
+        assert torch.equal(torch.get_rng_state(), rng_state)
+
+    def test_trainer_uses_background_evaluation(self, tmp_path):
+        cfg = TrainConfig(
+            num_episodes=20,
+            stats_path=str(tmp_path / "stats.csv"),
+            checkpoint_dir=str(tmp_path / "checkpoints"),
+            eval_every=5,
+            eval_episodes=2,
+        )
+        evaluator = AsyncEvaluator(EnvConfig(), AgentConfig(), cfg.eval_episodes, 200, cfg.seed)
+        torch.manual_seed(0)
+        trainer = Trainer(GameEnv(EnvConfig(), 0), ReinforceAgent(AgentConfig()), cfg,
+                          Logger(cfg.stats_path, verbose=False), evaluator=evaluator)
+        try:
+            summary = trainer.train()
+        finally:
+            evaluator.close()
+
+        assert summary["best_eval"] is not None
+        assert summary["best_eval"]["episode"] % 5 == 0
+        assert os.path.exists(tmp_path / "checkpoints" / "best.pt")
+        assert trainer.eval_snapshots == {}
+
+    def test_best_checkpoint_written_when_eval_every_exceeds_episodes(self, tmp_path):
+        cfg = TrainConfig(
+            num_episodes=5,
+            stats_path=str(tmp_path / "stats.csv"),
+            checkpoint_dir=str(tmp_path / "checkpoints"),
+            eval_every=100,
+            eval_episodes=2,
+        )
+        evaluator = AsyncEvaluator(EnvConfig(), AgentConfig(), cfg.eval_episodes, 200, cfg.seed)
+        torch.manual_seed(0)
+        trainer = Trainer(GameEnv(EnvConfig(), 0), ReinforceAgent(AgentConfig()), cfg,
+                          Logger(cfg.stats_path, verbose=False), evaluator=evaluator)
+        try:
+            summary = trainer.train()
+        finally:
+            evaluator.close()
+
+        assert summary["best_eval"]["episode"] == 5
+        assert os.path.exists(tmp_path / "checkpoints" / "best.pt")
+
+    def test_snapshot_submitted_once_worker_is_idle(self, tmp_path):
+        cfg = TrainConfig(num_episodes=1, stats_path=str(tmp_path / "stats.csv"),
+                          checkpoint_dir=str(tmp_path / "checkpoints"), eval_every=1, eval_episodes=1)
+        evaluator = AsyncEvaluator(EnvConfig(), AgentConfig(), cfg.eval_episodes, 50, cfg.seed)
+        trainer = Trainer(GameEnv(EnvConfig(), 0), ReinforceAgent(AgentConfig()), cfg,
+                          Logger(cfg.stats_path, verbose=False), evaluator=evaluator)
+        try:
+            trainer.handle_evaluation(1)
+            # Оценка закончилась после poll эпизода 1: следующий снимок не должен пропасть
+            while evaluator._results.empty():
+                time.sleep(0.01)
+            trainer.handle_evaluation(2)
+            assert 2 in trainer.eval_snapshots
+            evaluator.poll(wait=True)
+        finally:
+            evaluator.close()
@@ -0,0 +1,127 @@
+import threading
+
+import pytest
+import torch
+
+from src.agent.inference_server import InferenceClient, InferenceServer
+from src.agent.policy_network import PolicyNetwork
+
+
+def save_checkpoint(path, seed):
+    torch.manual_seed(seed)
+    torch.save(PolicyNetwork(4, 16, 3).state_dict(), path)
+    return str(path)
+
+
+class TestInferenceServer:
+    def test_concurrent_requests_are_batched(self, tmp_path):
+        ckpt = save_checkpoint(tmp_path / "a.pt", 0)
+        server = InferenceServer(ckpt, ("127.0.0.1", 0), max_batch=8, max_delay_ms=20.0, seed=0)
+        server.start()
+        results = []
+
+        def client_loop():
+            client = InferenceClient(server.address)
+            for _ in range(5):
+                results.append(client.select_action([3.0, 1.0, 2.0, 11.0]))
+            client.close()
+
+        try:
+            threads = [threading.Thread(target=client_loop) for _ in range(8)]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+
+            client = InferenceClient(server.address)
+            stats = client.stats()
+            client.close()
+        finally:
+            server.stop()
+
+        assert len(results) == 40
+        for action, probs in results:
+            assert action in (0, 1, 2)
+            assert abs(sum(probs) - 1.0) < 1e-5
+        assert stats["requests"] == 40
+        assert stats["batches"] < 40
+        assert "p99" in stats["latency_ms"]
+
+    def test_hot_reload(self, tmp_path):
+        a = save_checkpoint(tmp_path / "a.pt", 0)
+        b = save_checkpoint(tmp_path / "b.pt", 1)
+        server = InferenceServer(a, str(tmp_path / "policy.sock"), greedy=True)
+        server.start()
+        try:
+            client = InferenceClient(server.address)
+            state = [1.0, 2.0, 3.0, 4.0]
+            _, probs_a = client.select_action(state)
+            assert client.reload(b)["ok"]
+            _, probs_b = client.select_action(state)
+            client.close()
+        finally:
+            server.stop()
+
+        assert probs_a != probs_b
+
+    def test_bad_state_does_not_stop_batcher(self, tmp_path):
+        ckpt = save_checkpoint(tmp_path / "a.pt", 0)
+        server = InferenceServer(ckpt, ("127.0.0.1", 0), max_delay_ms=20.0, seed=0)
+        server.start()
+        try:
+            bad = InferenceClient(server.address)
+            assert "error" in bad.request({"state": [1.0, 2.0]})
+            assert "error" in bad.request({"state": ["a", "b", "c", "d"]})
+            bad.close()
+
+            good = InferenceClient(server.address)
+            good.sock.settimeout(5.0)
+            action, probs = good.select_action([1.0, 2.0, 3.0, 4.0])
+            good.close()
+        finally:
+            server.stop()
+
+        assert action in (0, 1, 2)
+        assert abs(sum(probs) - 1.0) < 1e-5
+
+    def test_bad_request_does_not_fail_batched_neighbours(self, tmp_path):
+        ckpt = save_checkpoint(tmp_path / "a.pt", 0)
+        # Большая задержка: плохой и хорошие запросы гарантированно попали бы в один батч
+        server = InferenceServer(ckpt, ("127.0.0.1", 0), max_batch=16, max_delay_ms=100.0, seed=0)
+        server.start()
+        bad_states = [["a", "b", "c", "d"], [1.0, float("nan"), 3.0, 4.0], [1.0, None, 3.0, 4.0], [[1.0], 2.0, 3.0, 4.0]]
+        good_replies, bad_replies = [], []
+
+        def good_client():
+            client = InferenceClient(server.address)
+            good_replies.append(client.request({"state": [1.0, 2.0, 3.0, 4.0]}))
+            client.close()
+
+        def bad_client(state):
+            client = InferenceClient(server.address)
+            bad_replies.append(client.request({"state": state}))
+            client.close()
+
+        try:
+            threads = [threading.Thread(target=good_client) for _ in range(6)]
+            threads += [threading.Thread(target=bad_client, args=(s,)) for s in bad_states]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+        finally:
+            server.stop()
+
+        assert len(good_replies) == 6
+        assert all("error" not in r and r["action"] in (0, 1, 2) for r in good_replies)
+        assert len(bad_replies) == len(bad_states)
+        assert all("error" in r for r in bad_replies)
+
+    def test_refuses_to_replace_regular_file(self, tmp_path):
+        ckpt = save_checkpoint(tmp_path / "a.pt", 0)
+        path = tmp_path / "notes.txt"
+        path.write_text("keep me")
+        server = InferenceServer(ckpt, str(path))
+        with pytest.raises(FileExistsError):
+            server.start()
+        assert path.read_text() == "keep me"
@@ -0,0 +1,50 @@
+import numpy as np
+
+from src.environment.game_env import GameEnv
+from src.environment.renderer import TiledRenderer
+from src.utils.config import EnvConfig, RenderConfig
+
+
+class TestTiledRenderer:
+    def test_headless_frame_layout(self):
+        cfg = EnvConfig()
+        envs = [GameEnv(cfg, seed) for seed in range(5)]
+        renderer = TiledRenderer(cfg, RenderConfig(), num_envs=5, cell_size=10, headless=True, max_fps=0)
+        frame = renderer.render(envs, labels=[f"{i}: 0" for i in range(5)])
+
+        # 5 сред -> сетка 3x2, между плитками зазор 2 px
+        assert renderer.cols == 3 and renderer.rows == 2
+        assert frame.shape == (2 * 120 + 2, 3 * 60 + 4, 3)
+        assert frame.dtype == np.uint8
+
+        # Агент каждой среды — в нижнем ряду своей плитки
+        agent_color = RenderConfig().colors["agent"]
+        for i, env in enumerate(envs):
+            row, col = divmod(i, 3)
+            y = row * 122 + 11 * 10 + 5
+            x = col * 62 + env.agent_x * 10 + 5
+            assert tuple(frame[y, x]) == agent_color
+
+    def test_render_is_throttled(self):
+        cfg = EnvConfig()
+        envs = [GameEnv(cfg, 0)]
+        renderer = TiledRenderer(cfg, RenderConfig(), num_envs=1, headless=True, max_fps=1.0)
+        assert renderer.render(envs) is not None
+        assert renderer.render(envs) is None
+        assert renderer.render(envs, force=True) is not None
+        assert renderer.frames_drawn == 2
+
+    def test_labels_callable_only_called_when_drawing(self):
+        cfg = EnvConfig()
+        envs = [GameEnv(cfg, 0)]
+        renderer = TiledRenderer(cfg, RenderConfig(), num_envs=1, headless=True, max_fps=1.0)
+        calls = []
+
+        def labels():
+            calls.append(1)
+            return ["0: 0"]
+
+        renderer.render(envs, labels)
+        assert not renderer.due()
+        renderer.render(envs, labels)
+        assert len(calls) == 1
@@ -0,0 +1,66 @@
+import numpy as np
+import torch
+
+from src.agent.policy_network import PolicyNetwork
+from src.agent.reinforce_agent import ReinforceAgent
+from src.agent.stacked_policy import StackedPolicyNetwork
+from src.environment.game_env import GameEnv
+from src.environment.vector_env import SubprocVectorEnv, SyncVectorEnv
+from src.training.evaluation import evaluate_episode
+from src.training.tournament import run_tournament
+from src.utils.config import AgentConfig, EnvConfig
+from src.utils.seed import derive_seed, training_seeds
+
+
+class TestDeriveSeed:
+    def test_depends_only_on_path(self):
+        assert derive_seed(42, "env", 3) == derive_seed(42, "env", 3)
+        assert training_seeds(42) == (derive_seed(42, "env"), derive_seed(42, "sampler"))
+        # seed + i пересекается между соседними root seed'ами, дочерние потоки — нет
+        assert derive_seed(42, "env", 1) != derive_seed(43, "env", 0)
+        assert derive_seed(42, "env", 0) != derive_seed(42, "eval_env", 0)
+        assert 0 <= derive_seed(42, "sampler") < 2 ** 63
+
+    def test_env_seed_defaults_to_config(self):
+        cfg = EnvConfig(seed=7)
+        assert np.array_equal(GameEnv(cfg).reset(), GameEnv(cfg, 7).reset())
+
+
+class TestParallelReproducibility:
+    def test_vector_env_independent_of_worker_count(self):
+        seeds = [derive_seed(1, "env", i) for i in range(4)]
+        actions = np.random.default_rng(0).integers(0, 3, size=(100, 4))
+
+        def rollout(vec_env):
+            obs = [vec_env.reset().copy()]
+            for a in actions:
+                obs.append(vec_env.step(a)[0].copy())
+            vec_env.close()
+            return np.stack(obs)
+
+        expected = rollout(SyncVectorEnv(EnvConfig(), seeds))
+        for num_workers in (1, 3):
+            assert np.array_equal(rollout(SubprocVectorEnv(EnvConfig(), seeds, num_workers=num_workers)), expected)
+
+    def test_evaluation_episodes_independent_of_order(self):
+        torch.manual_seed(0)
+        agent = ReinforceAgent(AgentConfig())
+        forward = [evaluate_episode(agent, EnvConfig(), 200, seed=5, episode=e) for e in range(4)]
+        backward = [evaluate_episode(agent, EnvConfig(), 200, seed=5, episode=e) for e in reversed(range(4))]
+        assert forward == backward[::-1]
+
+    def test_tournament_episodes_independent_of_batch(self):
+        torch.manual_seed(0)
+        stacked = StackedPolicyNetwork.from_policies([PolicyNetwork(4, 16, 3) for _ in range(2)])
+        rewards_2, steps_2 = run_tournament(stacked, EnvConfig(), num_episodes=2, max_steps=200, seed=1)
+        rewards_4, steps_4 = run_tournament(stacked, EnvConfig(), num_episodes=4, max_steps=200, seed=1)
+        assert np.array_equal(steps_2, steps_4[:, :2])
+        assert np.array_equal(rewards_2, rewards_4[:, :2])
+
+    def test_single_model_tournament_matches_evaluate_episode(self):
+        torch.manual_seed(0)
+        agent = ReinforceAgent(AgentConfig())
+        stacked = StackedPolicyNetwork.from_policies([agent.policy])
+        rewards, steps = run_tournament(stacked, EnvConfig(), num_episodes=6, max_steps=200, seed=3)
+        for e in range(6):
+            assert evaluate_episode(agent, EnvConfig(), 200, seed=3, episode=e) == (rewards[0, e], steps[0, e])
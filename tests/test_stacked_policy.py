@@ -0,0 +1,57 @@
+import torch
+
+from src.agent.policy_network import PolicyNetwork
+from src.agent.stacked_policy import StackedPolicyNetwork
+from src.training.tournament import run_tournament, rank_results
+from src.utils.config import EnvConfig
+
+
+class TestStackedPolicyNetwork:
+    def test_matches_individual_networks(self):
+        torch.manual_seed(0)
+        nets = [PolicyNetwork(4, 16, 3) for _ in range(3)]
+        stacked = StackedPolicyNetwork.from_policies(nets)
+
+        x = torch.randn(3, 5, 4)
+        out = stacked(x)
+        assert out.shape == (3, 5, 3)
+        for i, net in enumerate(nets):
+            assert torch.allclose(out[i], net(x[i]), atol=1e-6)
+
+    def test_state_dict_roundtrip(self):
+        torch.manual_seed(0)
+        nets = [PolicyNetwork(4, 16, 3) for _ in range(2)]
+        stacked = StackedPolicyNetwork.from_policies(nets)
+
+        restored = PolicyNetwork(4, 16, 3)
+        restored.load_state_dict(stacked.state_dict_of(1))
+        x = torch.randn(7, 4)
+        assert torch.allclose(restored(x), nets[1](x))
+
+
+class TestTournament:
+    def test_identical_models_tie_on_matched_episodes(self):
+        torch.manual_seed(0)
+        net = PolicyNetwork(4, 16, 3)
+        stacked = StackedPolicyNetwork.from_policies([net, net])
+
+        rewards, steps = run_tournament(stacked, EnvConfig(), num_episodes=4, max_steps=200, seed=1)
+        assert steps.shape == (2, 4)
+        assert (steps[0] == steps[1]).all()
+        assert (rewards[0] == rewards[1]).all()
+
+        table = rank_results(["a", "b"], rewards, steps)
+        assert table[1]["vs_leader"]["tie_rate"] == 1.0
+
+    def test_checkpoints_grouped_by_env_modes(self, tmp_path):
+        from run.tournament import expand_checkpoints, group_by_env
+
+        for name in ("a", "b", "c"):
+            (tmp_path / f"{name}.pt").touch()
+        specs = [str(tmp_path / "[ab].pt"), f"{tmp_path / 'c.pt'}:relative", f"{tmp_path / 'a.pt'}:relative:enhanced"]
+        groups = group_by_env(expand_checkpoints(specs, "absolute", "basic"))
+        assert groups == {
+            ("absolute", "basic"): [str(tmp_path / "a.pt"), str(tmp_path / "b.pt")],
+            ("relative", "basic"): [str(tmp_path / "c.pt")],
+            ("relative", "enhanced"): [str(tmp_path / "a.pt")],
+        }
@@ -0,0 +1,102 @@
+import numpy as np
+import pytest
+
+from src.utils.stats import RunningStats, t_value, z_value, bootstrap_ci, bootstrap_paired_diff_ci
+from src.training.evaluation import SequentialEvaluator
+
+
+class TestRunningStats:
+    def test_matches_numpy(self):
+        values = [3.0, 7.0, 1.0, 9.0, 4.0]
+        stats = RunningStats()
+        for v in values:
+            stats.push(v)
+
+        assert stats.n == 5
+        assert stats.mean == pytest.approx(np.mean(values))
+        assert stats.std == pytest.approx(np.std(values, ddof=1))
+        assert stats.min == 1.0 and stats.max == 9.0
+
+    def test_interval_undefined_for_single_value(self):
+        stats = RunningStats()
+        stats.push(1.0)
+        low, high = stats.confidence_interval()
+        assert low == -float("inf") and high == float("inf")
+        assert stats.to_dict()["ci_low"] is None
+
+    def test_student_t_interval(self):
+        # Табличные квантили t(0.975)
+        assert t_value(0.95, 1) == pytest.approx(12.706, abs=1e-3)
+        assert t_value(0.95, 9) == pytest.approx(2.262, abs=1e-3)
+        assert t_value(0.95, 30) == pytest.approx(2.042, abs=1e-3)
+        assert t_value(0.95, 5000) == pytest.approx(z_value(0.95))
+
+        stats = RunningStats()
+        for v in [3.0, 7.0, 1.0, 9.0, 4.0, 6.0, 2.0, 8.0, 5.0, 5.0]:
+            stats.push(v)
+        low, high = stats.confidence_interval(0.95)
+        assert (high - low) / 2 == pytest.approx(2.262 * stats.std / np.sqrt(10), rel=1e-3)
+
+
+class TestBootstrap:
+    def test_interval_contains_mean(self):
+        values = np.random.default_rng(0).normal(100.0, 10.0, size=50)
+        low, high = bootstrap_ci(values)
+        assert low < values.mean() < high
+
+    def test_paired_interval_removes_seed_variance(self):
+        # Большой разброс между seed'ами, но current стабильно на 5 меньше reference
+        rng = np.random.default_rng(0)
+        reference = rng.normal(1000.0, 300.0, size=10)
+        current = reference - 5.0 + rng.normal(0.0, 1.0, size=10)
+        low, high = bootstrap_paired_diff_ci(current, reference)
+        assert high < 0
+
+
+class TestSequentialEvaluator:
+    def test_constant_results_stop_at_min_episodes(self):
+        ev = SequentialEvaluator(max_episodes=100, min_episodes=5, steps_ci_width=10.0)
+        stopped_at = None
+        for i in range(100):
+            if ev.push(reward=20.0, steps=2000):
+                stopped_at = i + 1
+                break
+        assert stopped_at == 5
+        assert ev.stop_reason == "ci_width"
+
+    def test_clearly_worse_than_reference(self):
+        ev = SequentialEvaluator(max_episodes=100, min_episodes=5, reference_steps=2000.0)
+        for steps in [100, 120, 90, 110, 105]:
+            stop = ev.push(reward=0.0, steps=steps)
+        assert stop
+        assert ev.stop_reason == "worse_than_reference"
+
+    def test_reference_false_stop_rate_is_controlled(self):
+        # Чекпоинт равен reference: "better/worse" за все просмотры — ложные срабатывания
+        rng = np.random.default_rng(0)
+        false_stops = 0
+        for _ in range(300):
+            ev = SequentialEvaluator(max_episodes=100, min_episodes=10, reference_steps=500.0)
+            for steps in rng.normal(500.0, 100.0, size=100):
+                if ev.push(reward=0.0, steps=float(steps)):
+                    break
+            false_stops += ev.stop_reason != "max_episodes"
+        assert false_stops / 300 <= 0.05
+
+    def test_reference_uncertainty_widens_interval(self):
+        steps = [560, 540, 580, 550, 570, 545, 575, 555, 565, 560]
+        exact = SequentialEvaluator(max_episodes=100, min_episodes=10, reference_steps=500.0)
+        noisy = SequentialEvaluator(max_episodes=100, min_episodes=10, reference_steps=500.0,
+                                    reference_std=150.0, reference_n=10)
+        for s in steps:
+            exact.push(0.0, s)
+            noisy.push(0.0, s)
+        assert exact.stop_reason == "better_than_reference"
+        assert noisy.stop_reason is None
+
+    def test_runs_to_max_without_criteria(self):
+        ev = SequentialEvaluator(max_episodes=3)
+        assert not ev.push(0.0, 10)
+        assert not ev.push(0.0, 20)
+        assert ev.push(0.0, 30)
+        assert ev.summary()["stop_reason"] == "max_episodes"
@@ -0,0 +1,40 @@
+import numpy as np
+import pytest
+
+from src.environment.vector_env import SubprocVectorEnv, SyncVectorEnv
+from src.utils.config import EnvConfig
+
+
+def rollout(vec_env, actions):
+    out = [vec_env.reset().copy()]
+    for a in actions:
+        obs, rewards, dones, infos = vec_env.step(a)
+        out.append((obs.copy(), rewards.copy(), dones.copy(), [sorted(i) for i in infos]))
+    vec_env.close()
+    return out
+
+
+class TestVectorEnv:
+    @pytest.mark.parametrize("num_workers", [1, 3])
+    def test_subproc_matches_sync(self, num_workers):
+        seeds = [11, 12, 13, 14, 15]
+        actions = np.random.default_rng(0).integers(0, 3, size=(200, len(seeds)))
+
+        expected = rollout(SyncVectorEnv(EnvConfig(), seeds), actions)
+        got = rollout(SubprocVectorEnv(EnvConfig(), seeds, num_workers=num_workers), actions)
+
+        assert np.array_equal(expected[0], got[0])
+        for (e_obs, e_r, e_d, e_i), (g_obs, g_r, g_d, g_i) in zip(expected[1:], got[1:]):
+            assert np.array_equal(e_obs, g_obs)
+            assert np.array_equal(e_r, g_r)
+            assert np.array_equal(e_d, g_d)
+            assert e_i == g_i
+
+    def test_masked_envs_are_not_stepped(self):
+        vec_env = SubprocVectorEnv(EnvConfig(), [1, 2], num_workers=2, autoreset=False)
+        obs = vec_env.reset().copy()
+        next_obs, rewards, dones, _ = vec_env.step([1, 1], mask=[True, False])
+        assert np.array_equal(next_obs[1], obs[1])
+        assert next_obs[0][3] == obs[0][3] - 1  # block fell by one row
+        assert rewards[1] == 0.0 and not dones[1]
+        vec_env.close()